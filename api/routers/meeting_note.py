@@ -1,17 +1,32 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi import FastAPI, UploadFile, File, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import FastAPI, UploadFile, File, Form
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import asyncio
+import hashlib
+import json
 import os
+import time
 import uuid
+import zlib
+from urllib.parse import quote
 from src.config import GlobalConfig
-from api.services.meeting_note import process_text_job, process_media_job
+from api.services.job_queue import enqueue_job
+from src.artifacts import ARTIFACT_FORMATS, ArtifactUnavailable, artifact_etag, get_artifact, remove_artifacts
 from src.db import DatabaseManager
+from src.events import JobEventBus
+from src.executors import io_pool
+from src.languages import normalize_language
+from src.metrics import StageTimer
+from src.segments import SegmentStore
+from src.workspace import DiskQuotaExceeded, check_disk_quota, create_workspace, remove_workspace
 from src.logger import get_formatted_logger
 logger = get_formatted_logger(__name__)
 
 global_config = GlobalConfig()
 meeting_router = APIRouter(prefix="/meeting", tags=["meeting"])
 db_manager = DatabaseManager()
+event_bus = JobEventBus(db_manager, global_config.EVENT_CONFIG.poll_interval_seconds)
 
 def ensure_folder_exists(directory: str):
     if not os.path.exists(directory):
@@ -21,52 +36,156 @@ ensure_folder_exists(global_config.PathConfig.input_path)
 ensure_folder_exists(global_config.PathConfig.output_path)
 ensure_folder_exists(global_config.PathConfig.tempt_path)
 
+UPLOAD_CHUNK_SIZE = global_config.UPLOAD_CONFIG.chunk_size_kb * 1024
+MAX_UPLOAD_BYTES = {
+    f"{meeting_router.prefix}/upload/text": global_config.UPLOAD_CONFIG.max_text_mb * 1024 * 1024,
+    f"{meeting_router.prefix}/upload/media": global_config.UPLOAD_CONFIG.max_media_mb * 1024 * 1024,
+}
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the size limit of its endpoint"""
+
+async def reject_oversized_uploads(request: Request, call_next):
+    """HTTP middleware answering 413 before the body of an oversized upload is read"""
+    max_bytes = MAX_UPLOAD_BYTES.get(request.url.path)
+    content_length = request.headers.get("content-length")
+    if max_bytes and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        logger.warning(f"Rejected upload of {content_length} bytes to {request.url.path}")
+        return JSONResponse(status_code=413, content={"detail": f"Upload exceeds the limit of {max_bytes // (1024 * 1024)} MB"})
+    return await call_next(request)
+
+async def save_upload_file(file: UploadFile, file_path: str, max_bytes: int) -> Tuple[int, str]:
+    """Copy an upload into the job workspace chunk by chunk, return its size and the SHA-256 of its content.
+
+    Starlette has already received the whole body into the spooled temp
+    file of the UploadFile by then, so only one chunk of the copy is held in
+    memory. Raises UploadTooLarge if the upload is larger than `max_bytes`;
+    only reject_oversized_uploads turns uploads away before their body is read.
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds the limit of {max_bytes // (1024 * 1024)} MB")
+            sha256.update(chunk)
+            f.write(chunk)
+    return size, sha256.hexdigest()
+
 @meeting_router.post("/upload/text")
-async def upload_text(file: UploadFile = File(...), background_tasks: BackgroundTasks = None):
+async def upload_text(file: UploadFile = File(...)):
     """API to process text files"""
     try:
         logger.info(f"Received text upload request: {file.filename}")
         # Create job ID
         job_id = str(uuid.uuid4())
         
-        # Save temp file
-        file_path = os.path.join(global_config.PathConfig.tempt_path, f"{job_id}{os.path.splitext(file.filename)[1]}")
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        # Reject the job early if the temp disk can't hold it
+        check_disk_quota(file.size or 0)
         
-        logger.info(f"Created job {job_id} for file {file.filename}, saved to {file_path}")
+        # Save temp file in the job workspace
+        workspace = create_workspace(job_id)
+        file_path = os.path.join(workspace, f"{job_id}{os.path.splitext(file.filename)[1]}")
+        try:
+            write_start = time.perf_counter()
+            await save_upload_file(file, file_path, MAX_UPLOAD_BYTES[f"{meeting_router.prefix}/upload/text"])
+            upload_seconds = time.perf_counter() - write_start
+            
+            # Queue the job for the workers
+            await enqueue_job(job_id, "text", file_path, original_filename=file.filename, upload_seconds=upload_seconds)
+        except Exception:
+            remove_workspace(job_id)
+            raise
         
-        # Process file in background
-        background_tasks.add_task(process_text_job, file_path, job_id)
+        logger.info(f"Created job {job_id} for file {file.filename}, saved to {file_path}")
         
         return {"job_id": job_id, "status": "PENDING"}
+    except UploadTooLarge as e:
+        logger.warning(f"Rejected text upload {file.filename}: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except DiskQuotaExceeded as e:
+        logger.warning(f"Rejected text upload {file.filename}: {str(e)}")
+        raise HTTPException(status_code=507, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing text upload: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @meeting_router.post("/upload/media")
-async def upload_media(file: UploadFile = File(...), background_tasks: BackgroundTasks = None):
-    """API to process audio/video files"""
+async def upload_media(file: UploadFile = File(...), language: Optional[str] = Form(None)):
+    """API to process audio/video files, in `language` when given instead of the detected one"""
     try:
         logger.info(f"Received media upload request: {file.filename}")
+        try:
+            language = normalize_language(language)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Create job ID
         job_id = str(uuid.uuid4())
         
-        # Save temp file
-        file_path = os.path.join(global_config.PathConfig.tempt_path, f"{job_id}{os.path.splitext(file.filename)[1]}")
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        # Reject the job early if the temp disk can't hold it
+        check_disk_quota(file.size or 0)
         
-        logger.info(f"Created job {job_id} for file {file.filename}, saved to {file_path}")
+        # Save temp file in the job workspace
+        workspace = create_workspace(job_id)
+        file_path = os.path.join(workspace, f"{job_id}{os.path.splitext(file.filename)[1]}")
+        try:
+            write_start = time.perf_counter()
+            _, media_hash = await save_upload_file(file, file_path, MAX_UPLOAD_BYTES[f"{meeting_router.prefix}/upload/media"])
+            upload_seconds = time.perf_counter() - write_start
+            
+            # Same recording already summarized: serve the finished job instead of a new one
+            duplicate = await db_manager.find_media_fingerprint(media_hash)
+            if duplicate and duplicate["status"] == "COMPLETED" and duplicate["minutes_complete"]:
+                remove_workspace(job_id)
+                logger.info(f"Upload {file.filename} is a duplicate of completed job {duplicate['process_id']}")
+                return {"job_id": duplicate["process_id"], "status": "COMPLETED", "duplicate_of": duplicate["process_id"]}
+            
+            # Queue the job for the workers
+            await enqueue_job(job_id, "media", file_path, original_filename=file.filename, media_hash=media_hash, upload_seconds=upload_seconds, language=language)
+        except Exception:
+            remove_workspace(job_id)
+            raise
         
-        # Process file in background
-        background_tasks.add_task(process_media_job, file_path, job_id)
+        logger.info(f"Created job {job_id} for file {file.filename}, saved to {file_path}")
         
         return {"job_id": job_id, "status": "PENDING"}
+    except HTTPException:
+        raise
+    except UploadTooLarge as e:
+        logger.warning(f"Rejected media upload {file.filename}: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except DiskQuotaExceeded as e:
+        logger.warning(f"Rejected media upload {file.filename}: {str(e)}")
+        raise HTTPException(status_code=507, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing media upload: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@meeting_router.get("/jobs")
+async def list_jobs(status: Optional[str] = None, created_after: Optional[str] = None,
+                    created_before: Optional[str] = None, meeting_name: Optional[str] = None,
+                    q: Optional[str] = None, cursor: Optional[str] = None,
+                    limit: int = Query(50, ge=1, le=200)):
+    """API to list jobs, newest first, with filters and full-text search over transcripts"""
+    try:
+        logger.info(f"Listing jobs (status={status}, q={q}, cursor={cursor})")
+        return await db_manager.list_processes(
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            meeting_name=meeting_name,
+            query=q,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @meeting_router.get("/status/{job_id}")
 async def get_status(job_id: str):
     """API to check processing status using database"""
@@ -95,6 +214,65 @@ async def get_status(job_id: str):
         logger.error(f"Error checking job status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+FINAL_STATUSES = ("COMPLETED", "FAILED")
+
+def format_sse(event: Dict) -> str:
+    """Format a job event as a Server-Sent Events frame"""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+@meeting_router.get("/events/{job_id}")
+async def stream_job_events(job_id: str, request: Request):
+    """API streaming the status and progress events of a job as Server-Sent Events.
+
+    Reconnecting clients send the Last-Event-ID header and only receive the
+    events they missed. The stream ends once the job is COMPLETED or FAILED.
+    """
+    process = await db_manager.get_process(job_id)
+    if not process:
+        logger.warning(f"Job ID not found: {job_id}")
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    last_event_id = request.headers.get("last-event-id", "")
+    last_event_id = int(last_event_id) if last_event_id.isdigit() else 0
+    keepalive = global_config.EVENT_CONFIG.keepalive_seconds
+
+    async def event_stream():
+        # Subscribe before reading the history so no event falls in between
+        queue = await event_bus.subscribe(job_id)
+        try:
+            last_id = last_event_id
+            status = process["status"]
+            if not last_id:
+                yield f"event: status\ndata: {json.dumps({'status': status, 'error': process.get('error')})}\n\n"
+
+            for event in await db_manager.get_job_events([job_id], last_id):
+                last_id = event["id"]
+                status = event["data"].get("status", status) if event["event"] == "status" else status
+                yield format_sse(event)
+
+            while status not in FINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["id"] <= last_id:
+                    continue
+                last_id = event["id"]
+                if event["event"] == "status":
+                    status = event["data"].get("status", status)
+                yield format_sse(event)
+        finally:
+            event_bus.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @meeting_router.get("/details/{job_id}")
 async def get_job_details(job_id: str):
     """API to get comprehensive job details"""
@@ -146,10 +324,14 @@ async def get_job_details(job_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @meeting_router.get("/download/{job_id}")
-async def download_result(job_id: str):
-    """API to download results"""
+async def download_result(job_id: str, request: Request, format: str = Query("docx", pattern="^(md|docx|html|pdf|json)$")):
+    """API to download the meeting minutes as Markdown, Word, HTML, PDF or JSON.
+    
+    Each format is rendered from the minutes stored in the database on its
+    first request and cached on disk; the ETag lets clients revalidate.
+    """
     try:
-        logger.info(f"Download request for job: {job_id}")
+        logger.info(f"Download request for job: {job_id} ({format})")
         
         # Check if job exists and is completed
         process = await db_manager.get_process(job_id)
@@ -162,30 +344,216 @@ async def download_result(job_id: str):
             logger.warning(f"Job {job_id} not completed yet. Current status: {process['status']}")
             raise HTTPException(status_code=400, detail="Job not completed yet")
         
-        # Get file path
-        file_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}.docx")
-        
-        if not os.path.exists(file_path):
-            logger.error(f"Output file not found: {file_path}")
-            raise HTTPException(status_code=404, detail="Output file not found")
-        
         # Get meeting name for filename if available
         transcript_data = await db_manager.get_transcript_data(job_id)
-        filename = "meeting_minutes.docx"
-        if transcript_data and transcript_data.get("meeting_name"):
-            filename = f"{transcript_data['meeting_name'].replace(' ', '_')}_minutes.docx"
+        meeting_name = transcript_data.get("meeting_name") if transcript_data else None
+        filename = f"{meeting_name.replace(' ', '_')}_minutes.{format}" if meeting_name else f"meeting_minutes.{format}"
+        
+        minutes = await db_manager.get_meeting_minutes(job_id)
+        if not minutes or not minutes["complete"]:
+            # Jobs completed before the minutes were stored only have their Word document
+            file_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}.docx")
+            if format != "docx" or not os.path.exists(file_path):
+                logger.error(f"Minutes of job {job_id} not found")
+                raise HTTPException(status_code=404, detail="Output file not found")
+            logger.info(f"Sending file: {file_path} as {filename}")
+            return FileResponse(file_path, filename=filename)
+        
+        # Revalidations are answered from the minutes alone, without rendering them
+        etag = artifact_etag(minutes["markdown"], format)
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), f'"{etag}"'):
+            return Response(status_code=304, headers=headers)
+        
+        timer = StageTimer()
+        try:
+            file_path, _ = await io_pool.run(get_artifact, job_id, minutes["markdown"], format, meeting_name, timer)
+        except ArtifactUnavailable as e:
+            logger.warning(f"Can't render job {job_id} as {format}: {str(e)}")
+            raise HTTPException(status_code=501, detail=str(e))
+        if timer.observations:
+            try:
+                await db_manager.record_stage_timings(timer.observations)
+            except Exception as e:
+                logger.warning(f"Could not record the render timing of job {job_id}: {str(e)}")
         
         logger.info(f"Sending file: {file_path} as {filename}")
-        return FileResponse(file_path, filename=filename)
+        return FileResponse(file_path, media_type=ARTIFACT_FORMATS[format][1], filename=filename, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error downloading result: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+TRANSCRIPT_MEDIA_TYPES = {
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+}
+
+# Transcripts are sent in blocks of this size
+TRANSCRIPT_STREAM_CHUNK_BYTES = 64 * 1024
+# Smaller transcripts aren't worth compressing
+GZIP_MIN_BYTES = 1024
+
+def _etag_matches(if_none_match: Optional[str], *etags: str) -> bool:
+    """Whether an If-None-Match (or If-Range) header matches one of the quoted ETags"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or any(etag in tags for etag in etags)
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def _parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (first, last) offsets.
+
+    Returns None to send the whole body (no header, or a multi-range or
+    malformed one) and raises 416 if the range lies outside the body.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            first, last = max(0, size - int(last)), size - 1
+        else:
+            first, last = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if first >= size or first > last:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return first, last
+
+def _split_blocks(data: bytes) -> Iterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(data), TRANSCRIPT_STREAM_CHUNK_BYTES):
+        yield bytes(view[offset:offset + TRANSCRIPT_STREAM_CHUNK_BYTES])
+
+def _iter_body(blocks: Iterable[bytes], compress: bool) -> Iterator[bytes]:
+    """Yield the blocks of a body, gzipped on the fly if asked"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    for block in blocks:
+        if compressor:
+            block = compressor.compress(block)
+        if block:
+            yield block
+    if compressor:
+        yield compressor.flush()
+
+def _content_disposition(filename: str) -> str:
+    # Same encoding as FileResponse, non-ASCII meeting names need RFC 5987
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+async def _get_segments(job_id: str, start: Optional[float], end: Optional[float]) -> SegmentStore:
+    segments = SegmentStore.from_rows(await db_manager.get_transcript_segments(job_id, start, end))
+    if not segments and not await db_manager.get_transcript_segments(job_id):
+        logger.warning(f"No timestamped segments for job: {job_id}")
+        raise HTTPException(status_code=404, detail="No timestamped segments for this job")
+    return segments
+
+@meeting_router.get("/transcript/{job_id}/segments")
+async def get_transcript_segments(job_id: str, start: Optional[float] = Query(None, ge=0), end: Optional[float] = Query(None, ge=0)):
+    """API to get the timestamped segments of a transcript, optionally between `start` and `end` seconds"""
+    try:
+        segments = await _get_segments(job_id, start, end)
+        return {
+            "job_id": job_id,
+            "segments": [segment._asdict() for segment in segments]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting transcript segments: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@meeting_router.get("/transcript/{job_id}/partial")
+async def get_partial_transcript(job_id: str):
+    """API to read the transcript of a media job while it is being transcribed.
+
+    Returns the text of the chunks decoded so far, or the full transcript
+    once it is saved (`complete` is then true).
+    """
+    try:
+        process = await db_manager.get_process(job_id)
+        
+        if not process:
+            logger.warning(f"Job ID not found for partial transcript: {job_id}")
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        transcript_data = await db_manager.get_transcript_data(job_id)
+        if transcript_data:
+            return {
+                "job_id": job_id,
+                "status": process["status"],
+                "complete": True,
+                "completed_chunks": None,
+                "total_chunks": None,
+                "text": transcript_data.get("transcript_text", "")
+            }
+        
+        chunks = await db_manager.get_transcript_chunks(job_id)
+        return {
+            "job_id": job_id,
+            "status": process["status"],
+            "complete": False,
+            "completed_chunks": len(chunks),
+            "total_chunks": chunks[0][1] if chunks else None,
+            # Chunks are saved in order, so this is always the start of the transcript
+            "text": " ".join(text for _, _, text in chunks if text)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting partial transcript: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@meeting_router.get("/minutes/{job_id}/partial")
+async def get_partial_minutes(job_id: str):
+    """API to read the meeting minutes while the LLM is writing them.
+
+    `complete` is true once the minutes are finished, the Word document may
+    still be in the making.
+    """
+    try:
+        process = await db_manager.get_process(job_id)
+        
+        if not process:
+            logger.warning(f"Job ID not found for partial minutes: {job_id}")
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        minutes = await db_manager.get_meeting_minutes(job_id)
+        return {
+            "job_id": job_id,
+            "status": process["status"],
+            "complete": minutes["complete"] if minutes else False,
+            "updated_at": minutes["updated_at"] if minutes else None,
+            "text": minutes["markdown"] if minutes else ""
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting partial minutes: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @meeting_router.get("/download/{job_id}/transcript")
-async def download_transcript(job_id: str):
-    """API to download transcript for media files"""
+async def download_transcript(job_id: str, request: Request, format: str = Query("txt", pattern="^(txt|srt|vtt)$"),
+                              start: Optional[float] = Query(None, ge=0), end: Optional[float] = Query(None, ge=0)):
+    """API to download transcript for media files, as plain text or SRT/VTT subtitles.
+
+    `start` and `end` (seconds) restrict the transcript to a time range.
+    The transcript is streamed from the database, gzipped if the client
+    accepts it, with byte Range and ETag/If-None-Match support.
+    """
     try:
         logger.info(f"Transcript download request for job: {job_id}")
         
@@ -196,38 +564,118 @@ async def download_transcript(job_id: str):
             logger.warning(f"Job ID not found for transcript download: {job_id}")
             raise HTTPException(status_code=404, detail="Job not found")
             
-        # Get transcript data
-        transcript_data = await db_manager.get_transcript_data(job_id)
+        # Get transcript data, without its text
+        transcript_info = await db_manager.get_transcript_info(job_id)
         
-        if not transcript_data:
+        if not transcript_info:
             logger.error(f"Transcript data not found for job: {job_id}")
             raise HTTPException(status_code=404, detail="Transcript data not found")
         
-        # Create a temporary file with the transcript text
-        transcript_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}_transcript.txt")
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript_data.get("transcript_text", ""))
-        
         # Get meeting name for filename if available
-        filename = "transcript.txt"
-        if transcript_data.get("meeting_name"):
-            filename = f"{transcript_data['meeting_name'].replace(' ', '_')}_transcript.txt"
+        filename = f"transcript.{format}"
+        if transcript_info.get("meeting_name"):
+            filename = f"{transcript_info['meeting_name'].replace(' ', '_')}_transcript.{format}"
+        
+        full_text = format == "txt" and start is None and end is None
+        etag = transcript_info["transcript_hash"][:32]
+        if not full_text:
+            # Subtitles and time ranges are rendered from the segments saved with the transcript
+            etag = hashlib.sha256(f"{etag}|{format}|{start}|{end}".encode("utf-8")).hexdigest()[:32]
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": "no-cache",
+            "Accept-Ranges": "bytes",
+            "Vary": "Accept-Encoding",
+            "Content-Disposition": _content_disposition(filename),
+        }
+        if _etag_matches(request.headers.get("if-none-match"), f'"{etag}"', f'"{etag}-gzip"'):
+            return Response(status_code=304, headers=headers)
+        
+        if full_text:
+            size = transcript_info["transcript_bytes"]
+            content = None
+        else:
+            segments = await _get_segments(job_id, start, end)
+            content = {"txt": segments.text, "srt": segments.to_srt, "vtt": segments.to_vtt}[format]().encode("utf-8")
+            size = len(content)
+        
+        # A Range is only honoured against the current version of the transcript
+        if_range = request.headers.get("if-range")
+        byte_range = _parse_range(request.headers.get("range"), size) if not if_range or _etag_matches(if_range, f'"{etag}"') else None
+        if byte_range:
+            first, last = byte_range
+            if content is None:
+                # Only the requested window is read from the database
+                blocks = db_manager.iter_transcript_bytes(job_id, first, last - first + 1, TRANSCRIPT_STREAM_CHUNK_BYTES)
+            else:
+                blocks = _split_blocks(content[first:last + 1])
+            headers.update({"Content-Range": f"bytes {first}-{last}/{size}", "Content-Length": str(last - first + 1)})
+            logger.info(f"Sending bytes {first}-{last}/{size} of transcript for {job_id}")
+            return StreamingResponse(_iter_body(blocks, False), status_code=206, media_type=TRANSCRIPT_MEDIA_TYPES[format], headers=headers)
+        
+        if content is None:
+            # Streamed from the database block by block, never held whole in memory
+            blocks = db_manager.iter_transcript_bytes(job_id, chunk_size=TRANSCRIPT_STREAM_CHUNK_BYTES)
+        else:
+            blocks = _split_blocks(content)
+        compress = size >= GZIP_MIN_BYTES and _accepts_gzip(request.headers.get("accept-encoding"))
+        if compress:
+            # The gzipped body is a different representation, with its own ETag
+            headers.update({"ETag": f'"{etag}-gzip"', "Content-Encoding": "gzip"})
+        else:
+            headers["Content-Length"] = str(size)
         
-        logger.info(f"Sending transcript file for {job_id}")
-        return FileResponse(transcript_path, filename=filename)
+        logger.info(f"Sending transcript of {job_id}" + (" (gzip)" if compress else ""))
+        return StreamingResponse(_iter_body(blocks, compress), media_type=TRANSCRIPT_MEDIA_TYPES[format], headers=headers)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error downloading transcript: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@meeting_router.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str):
+    """API to queue a failed job again.
+
+    Media jobs resume from the chunks transcribed before the failure.
+    """
+    try:
+        process = await db_manager.get_process(job_id)
+        
+        if not process:
+            logger.warning(f"Job ID not found for retry: {job_id}")
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        if process["status"] != "FAILED":
+            raise HTTPException(status_code=409, detail=f"Only failed jobs can be retried, job is {process['status']}")
+        
+        payload = await db_manager.get_job_payload(job_id)
+        if not payload or not os.path.exists(payload.get("file_path", "")):
+            logger.warning(f"Uploaded file of job {job_id} is gone, it can't be retried")
+            raise HTTPException(status_code=409, detail="The uploaded file of this job is no longer available")
+        
+        if not await db_manager.requeue_job(job_id):
+            raise HTTPException(status_code=409, detail="Job can't be retried")
+        
+        logger.info(f"Job {job_id} queued again")
+        return {"job_id": job_id, "status": "PENDING"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrying job: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @meeting_router.delete("/cleanup")
 async def cleanup_old_jobs(hours: int = 24):
     """API to clean up old jobs from the database"""
     try:
         logger.info(f"Cleaning up jobs older than {hours} hours")
-        await db_manager.cleanup_old_processes(hours)
+        job_ids = await db_manager.cleanup_old_processes(hours)
+        # Deleted jobs can't be retried anymore: drop their files too, including those failed jobs kept for a retry
+        for job_id in job_ids:
+            remove_workspace(job_id)
+            remove_artifacts(job_id)
         return {"status": "success", "message": f"Cleaned up jobs older than {hours} hours"}
     except Exception as e:
         logger.error(f"Error cleaning up old jobs: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
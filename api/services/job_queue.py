@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+from src.db import DatabaseManager
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+db_manager = DatabaseManager()
+
+# Job types the workers can run, see JOB_HANDLERS in api.services.job_worker
+JOB_TYPES = ("text", "media")
+# Interval between two reports of the executor pool stats by each worker
+EXECUTOR_STATS_INTERVAL_SECONDS = 5
+
+def executor_stats_cutoff() -> str:
+    """Timestamp before which the executor stats of a worker are stale: the worker stopped reporting"""
+    return (datetime.utcnow() - timedelta(seconds=3 * EXECUTOR_STATS_INTERVAL_SECONDS)).isoformat()
+
+async def enqueue_job(job_id: str, job_type: str, file_path: str, **payload):
+    """Queue a job for the workers"""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Unknown job type: {job_type}")
+    await db_manager.create_process(job_id, job_type=job_type, payload={"file_path": file_path, **payload})
+    logger.info(f"Queued {job_type} job {job_id}")
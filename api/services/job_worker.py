@@ -0,0 +1,148 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict
+from api.services.job_queue import EXECUTOR_STATS_INTERVAL_SECONDS, db_manager, executor_stats_cutoff
+from api.services.meeting_note import process_text_job, process_media_job
+from src.workspace import list_workspaces, remove_workspace
+from src.executors import executor_stats
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+global_config = GlobalConfig()
+
+# Only imported by the worker process: the handlers load the whole transcription and LLM pipeline
+JOB_HANDLERS = {
+    "text": process_text_job,
+    "media": process_media_job,
+}
+# Interval between two sweeps of the workspaces kept by failed jobs
+WORKSPACE_SWEEP_SECONDS = 300
+
+class JobWorker:
+    """Pulls queued jobs from the summary_processes table and runs them.
+
+    Claimed jobs hold a lease that is extended by heartbeats while they run.
+    If a worker dies, its lease expires and the job is picked up again by
+    another worker.
+    """
+
+    def __init__(self, concurrency: int = None, poll_interval: float = None, lease_seconds: int = None):
+        queue_config = global_config.QUEUE_CONFIG
+        self.concurrency = concurrency or queue_config.worker_concurrency
+        self.poll_interval = poll_interval or queue_config.poll_interval_seconds
+        self.lease_seconds = lease_seconds or queue_config.lease_seconds
+        self.heartbeat_interval = max(1, self.lease_seconds // 3)
+        self.max_attempts = queue_config.max_attempts
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._running: Dict[str, asyncio.Task] = {}
+        self._last_sweep = None
+
+    async def run(self):
+        """Claim and run jobs until the task running this coroutine is cancelled"""
+        logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+        slots = asyncio.Semaphore(self.concurrency)
+        reporter = asyncio.create_task(self._report_executor_stats())
+        try:
+            while True:
+                await self._expire_failed_workspaces()
+                await slots.acquire()
+                try:
+                    job = await db_manager.claim_next_job(self.worker_id, self.lease_seconds)
+                except Exception as e:
+                    logger.error(f"Error claiming job: {str(e)}")
+                    job = None
+
+                if not job:
+                    slots.release()
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                task = asyncio.create_task(self._run_job(job))
+                self._running[job["id"]] = task
+                task.add_done_callback(lambda _, job_id=job["id"]: (self._running.pop(job_id, None), slots.release()))
+        finally:
+            reporter.cancel()
+            await self._shutdown()
+
+    async def _shutdown(self):
+        """Cancel running jobs and hand them back to the queue"""
+        for job_id, task in list(self._running.items()):
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await db_manager.release_job(job_id, self.worker_id)
+            logger.info(f"Released job {job_id} back to the queue")
+        try:
+            await db_manager.delete_executor_stats(self.worker_id)
+        except Exception as e:
+            logger.warning(f"Could not remove the executor stats of worker {self.worker_id}: {str(e)}")
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _run_job(self, job: Dict):
+        job_id = job["id"]
+        logger.info(f"Worker {self.worker_id} claimed {job['job_type']} job {job_id} (attempt {job['attempts']}), executors: {executor_stats()}")
+
+        error = None
+        if job["job_type"] not in JOB_HANDLERS:
+            error = f"Unknown job type: {job['job_type']}"
+        elif job["attempts"] > self.max_attempts:
+            error = f"Job abandoned after {self.max_attempts} attempts"
+        if error:
+            logger.error(f"Job {job_id} can't be run: {error}")
+            await db_manager.update_process(job_id, "FAILED", error=error)
+            remove_workspace(job_id)
+            return
+
+        handler = JOB_HANDLERS[job["job_type"]]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await handler(job_id=job_id, **job["payload"])
+        except Exception as e:
+            # The handler has already marked the job as FAILED. Its files are kept so it
+            # can be retried, until TEMP_FAILED_RETENTION_HOURS or the job is cleaned up
+            logger.error(f"Job {job_id} failed, keeping its files for a retry: {str(e)}")
+            return
+        finally:
+            heartbeat.cancel()
+
+        # Not reached when the job is cancelled: its files are kept for the next attempt
+        logger.info(f"Job {job_id} done")
+        remove_workspace(job_id)
+
+    async def _expire_failed_workspaces(self):
+        """Delete the workspaces failed jobs kept for a retry once their retention is over"""
+        if self._last_sweep is not None and time.monotonic() - self._last_sweep < WORKSPACE_SWEEP_SECONDS:
+            return
+        self._last_sweep = time.monotonic()
+        retention_hours = global_config.WORKSPACE_CONFIG.failed_retention_hours
+        try:
+            job_ids = await db_manager.get_expired_failed_jobs(list_workspaces(), (datetime.utcnow() - timedelta(hours=retention_hours)).isoformat())
+            for job_id in job_ids:
+                remove_workspace(job_id)
+            if job_ids:
+                logger.info(f"Removed the workspaces of {len(job_ids)} jobs failed more than {retention_hours:g} hours ago")
+        except Exception as e:
+            logger.warning(f"Could not expire the workspaces of failed jobs: {str(e)}")
+
+    async def _report_executor_stats(self):
+        """Publish the load of the executor pools of this worker, for /health and /metrics"""
+        while True:
+            try:
+                await db_manager.save_executor_stats(self.worker_id, executor_stats(), executor_stats_cutoff())
+            except Exception as e:
+                logger.warning(f"Could not report executor stats: {str(e)}")
+            await asyncio.sleep(EXECUTOR_STATS_INTERVAL_SECONDS)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await db_manager.heartbeat_job(job_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Worker {self.worker_id} lost the lease on job {job_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for job {job_id}: {str(e)}")
@@ -1,6 +1,12 @@
-from src.flow.export_meeting_minutes import export_to_word, export_meeting_minutes
-from src.flow.export_transcript import process_audio_video
+from src.artifacts import available_formats
+from src.flow.export_meeting_minutes import export_meeting_minutes, get_summary_chunking
+from src.flow.export_transcript import process_audio_video_timed
 from src.db import DatabaseManager
+from src.checkpoints import TranscriptCheckpoint
+from src.events import ChunkProgressReporter, PartialMinutesBuffer
+from src.executors import transcription_pool, llm_pool
+from src.metrics import StageTimer
+from src.segments import SegmentStore
 import os
 import time
 from src.config import GlobalConfig
@@ -10,48 +16,81 @@ logger = get_formatted_logger(__name__)
 db_manager = DatabaseManager()
 global_config = GlobalConfig()
 
-async def process_text_job(file_path, job_id):
-    """Process text files in background with database tracking"""
+def _create_timer(upload_seconds=None):
+    """Create the stage timer of a job.
+
+    The stage_timings stored with a completed job don't include the db_write
+    span of its final update, which only ends once that update is written.
+    The stage histograms, recorded afterwards, do include it.
+    """
+    timer = StageTimer()
+    if upload_seconds is not None:
+        # Timed by the API when the upload was written to the workspace
+        timer.add("upload_write", upload_seconds)
+    return timer
+
+async def _summarize(job_id, transcript_path, cache_stats, timer):
+    """Generate the minutes of a job, streaming them to the partial minutes when enabled, and save them"""
+    minutes_buffer = PartialMinutesBuffer(job_id) if global_config.SUMMARY_CONFIG.streaming else None
+    meeting_minutes = await llm_pool.run(export_meeting_minutes, transcript_path, cache_stats, timer, minutes_buffer)
+    await db_manager.save_meeting_minutes(job_id, meeting_minutes)
+    return meeting_minutes
+
+async def _record_timings(job_id, timer):
+    """Add the stage timings of a job to the stage histograms"""
+    try:
+        await db_manager.record_stage_timings(timer.observations)
+    except Exception as e:
+        logger.warning(f"Could not record stage timings of job {job_id}: {str(e)}")
+
+async def process_text_job(file_path, job_id, original_filename=None, upload_seconds=None):
+    """Process a queued text job with database tracking"""
+    timer = _create_timer(upload_seconds)
     try:
-        # Create process in database
-        await db_manager.create_process(job_id)
         start_time = time.time()
         
         logger.info(f"Processing text job {job_id} from {file_path}")
         
         # Process transcript
-        meeting_minutes = export_meeting_minutes(file_path)
-        
-        # Export to Word
-        output_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}.docx")
-        export_to_word(meeting_minutes, output_path)
+        await db_manager.update_process(job_id, "SUMMARIZING")
+        cache_stats = {"hits": 0, "misses": 0}
+        # The minutes are rendered to documents on download
+        meeting_minutes = await _summarize(job_id, file_path, cache_stats, timer)
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
-        # Save transcript data
-        await db_manager.save_transcript(
-            process_id=job_id,
-            transcript_text=open(file_path, 'r').read(),
-            model=global_config.GEMINI_CONFIG.model_id,
-            model_name=global_config.GEMINI_CONFIG.model_name,
-            chunk_size=0,  # Not applicable for text
-            overlap=0      # Not applicable for text
-        )
-        
+        # Save transcript data and complete the job in a single commit
+        transcript_text = open(file_path, 'r').read()
+        chunk_size, overlap = get_summary_chunking(transcript_text)
         # Extract meeting name from minutes (assuming it's in the first line or header)
         meeting_name = meeting_minutes.split('\n')[0].replace('#', '').strip()
-        await db_manager.update_meeting_name(job_id, meeting_name)
-        
-        # Update process status to completed
-        await db_manager.update_process(
-            process_id=job_id, 
-            status="COMPLETED",
-            result={"output_path": output_path},
-            chunk_count=1,
-            processing_time=processing_time,
-            metadata={"file_type": "text", "original_filename": os.path.basename(file_path)}
-        )
+        with timer.span("db_write"):
+            async with db_manager.transaction():
+                await db_manager.save_transcript(
+                    process_id=job_id,
+                    transcript_text=transcript_text,
+                    model=global_config.GEMINI_CONFIG.model_id,
+                    model_name=global_config.GEMINI_CONFIG.model_name,
+                    chunk_size=chunk_size,  # Summarization chunk size in tokens, 0 for a single pass
+                    overlap=overlap
+                )
+                await db_manager.update_meeting_name(job_id, meeting_name)
+            
+                # Update process status to completed
+                await db_manager.update_process(
+                    process_id=job_id, 
+                    status="COMPLETED",
+                    result={"formats": available_formats()},
+                    chunk_count=1,
+                    processing_time=processing_time,
+                    metadata={
+                        "file_type": "text",
+                        "original_filename": original_filename or os.path.basename(file_path),
+                        "llm_cache": cache_stats,
+                        "stage_timings": timer.summary()
+                    }
+                )
         
         logger.info(f"Text job {job_id} completed successfully")
         
@@ -61,69 +100,106 @@ async def process_text_job(file_path, job_id):
         await db_manager.update_process(
             process_id=job_id,
             status="FAILED",
-            error=str(e)
+            error=str(e),
+            metadata={"stage_timings": timer.summary()}
         )
         raise e
+    finally:
+        await _record_timings(job_id, timer)
 
-async def process_media_job(file_path, job_id):
-    """Process audio/video files in background with database tracking"""
+async def process_media_job(file_path, job_id, original_filename=None, media_hash=None, upload_seconds=None, language=None):
+    """Process a queued audio/video job with database tracking.
+
+    When a file with the same `media_hash` was transcribed before, its
+    transcript is reused and Whisper is skipped. `language` skips the
+    language detection. A retried job resumes from its saved transcript, or
+    from the last chunk transcribed before it failed.
+    """
+    timer = _create_timer(upload_seconds)
     try:
-        # Create process in database
-        await db_manager.create_process(job_id)
         start_time = time.time()
         
         logger.info(f"Processing media job {job_id} from {file_path}")
         
-        # Convert media to transcript
-        await db_manager.update_process(job_id, "TRANSCRIBING")
-        transcript_path = process_audio_video(file_path)
-        
-        # Read transcript
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
+        # A retried job may have saved its transcript before failing
+        duplicate = await db_manager.get_transcript_data(job_id)
+        if not duplicate and media_hash:
+            duplicate = await db_manager.find_media_fingerprint(media_hash)
+        if duplicate:
+            # Same recording transcribed before: go straight to summarization
+            logger.info(f"Reusing transcript of job {duplicate['process_id']} for media job {job_id}")
+            transcript_text = duplicate["transcript_text"]
+            segments = SegmentStore.from_rows(await db_manager.get_transcript_segments(duplicate["process_id"]), language)
+            transcript_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}_transcript.txt")
+            with open(transcript_path, 'w', encoding='utf-8') as f:
+                f.write(transcript_text)
+        else:
+            # Convert media to transcript, the worker process sends back its stage timings
+            await db_manager.update_process(job_id, "TRANSCRIBING")
+            transcript_path, segments, transcription_timings = await transcription_pool.run(
+                process_audio_video_timed, file_path, ChunkProgressReporter(job_id), language, TranscriptCheckpoint(job_id)
+            )
+            timer.merge(transcription_timings)
+            
+            # Read transcript
+            with open(transcript_path, 'r', encoding='utf-8') as f:
+                transcript_text = f.read()
         
         # Save transcript data
         file_type = "audio" if file_path.endswith(('.mp3', '.wav')) else "video"
-        await db_manager.save_transcript(
-            process_id=job_id,
-            transcript_text=transcript_text,
-            model="whisper-tiny",  # Based on your transcription code
-            model_name="whisper-tiny",
-            chunk_size=30000,  # 30s chunks from your code
-            overlap=0
-        )
+        whisper_model = f"whisper-{global_config.WHISPER_CONFIG.model_size}"
+        chunk_size, overlap = get_summary_chunking(transcript_text)
+        with timer.span("db_write"):
+            async with db_manager.transaction():
+                await db_manager.save_transcript(
+                    process_id=job_id,
+                    transcript_text=transcript_text,
+                    model=whisper_model,
+                    model_name=whisper_model,
+                    chunk_size=chunk_size,  # Summarization chunk size in tokens, 0 for a single pass
+                    overlap=overlap
+                )
+                await db_manager.save_transcript_segments(job_id, segments.to_rows())
+                await db_manager.delete_transcript_chunks(job_id)
+                if media_hash:
+                    await db_manager.save_media_fingerprint(media_hash, job_id)
+                await db_manager.update_process(job_id, "SUMMARIZING")
         
         # Process transcript
-        await db_manager.update_process(job_id, "SUMMARIZING")
-        meeting_minutes = export_meeting_minutes(transcript_path)
+        cache_stats = {"hits": 0, "misses": 0}
+        meeting_minutes = await _summarize(job_id, transcript_path, cache_stats, timer)
         
         # Extract meeting name from minutes (assuming it's in the first line or header)
         meeting_name = meeting_minutes.split('\n')[0].replace('#', '').strip()
-        await db_manager.update_meeting_name(job_id, meeting_name)
-        
-        # Export to Word
-        output_path = os.path.join(global_config.PathConfig.output_path, f"{job_id}.docx")
-        export_to_word(meeting_minutes, output_path)
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
         # Update process status to completed
-        await db_manager.update_process(
-            process_id=job_id, 
-            status="COMPLETED",
-            result={
-                "output_path": output_path,
-                "transcript_path": transcript_path
-            },
-            chunk_count=os.path.getsize(file_path) // 30000 + 1,  # Approximate chunk count
-            processing_time=processing_time,
-            metadata={
-                "file_type": file_type,
-                "original_filename": os.path.basename(file_path),
-                "audio_length_seconds": os.path.getsize(file_path) // 48000  # Rough estimate
-            }
-        )
+        with timer.span("db_write"):
+            async with db_manager.transaction():
+                await db_manager.update_meeting_name(job_id, meeting_name)
+                await db_manager.update_process(
+                    process_id=job_id, 
+                    status="COMPLETED",
+                    result={
+                        "formats": available_formats(),
+                        "transcript_path": transcript_path
+                    },
+                    chunk_count=os.path.getsize(file_path) // 30000 + 1,  # Approximate chunk count
+                    processing_time=processing_time,
+                    metadata={
+                        "file_type": file_type,
+                        "original_filename": original_filename or os.path.basename(file_path),
+                        "media_hash": media_hash,
+                        "language": language or segments.language,
+                        "segment_count": len(segments),
+                        "reused_transcript_from": duplicate["process_id"] if duplicate else None,
+                        "audio_length_seconds": os.path.getsize(file_path) // 48000,  # Rough estimate
+                        "llm_cache": cache_stats,
+                        "stage_timings": timer.summary()
+                    }
+                )
         
         logger.info(f"Media job {job_id} completed successfully")
         
@@ -133,6 +209,9 @@ async def process_media_job(file_path, job_id):
         await db_manager.update_process(
             process_id=job_id,
             status="FAILED",
-            error=str(e)
+            error=str(e),
+            metadata={"stage_timings": timer.summary()}
         )
-        raise e
\ No newline at end of file
+        raise e
+    finally:
+        await _record_timings(job_id, timer)
\ No newline at end of file
@@ -1,14 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers.meeting_note import meeting_router
+from fastapi.responses import PlainTextResponse
+from api.routers.meeting_note import meeting_router, reject_oversized_uploads, event_bus
+from api.services.job_queue import executor_stats_cutoff
+from src.db import DatabaseManager
+from src.metrics import render_prometheus
+
+db_manager = DatabaseManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop relaying job events, then close the pooled database connections
+    await event_bus.close()
+    await db_manager.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="Multi-Agent Chat API",
     description="API for interacting with multi-agent chat system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+# Answer 413 to oversized uploads before their body is read. Registered before
+# CORSMiddleware, which wraps it, so cross-origin clients see the 413
+app.middleware("http")(reject_oversized_uploads)
+
 # Add CORS middleware to allow Streamlit to communicate with the API
 app.add_middleware(
     CORSMiddleware,
@@ -24,4 +43,21 @@ app.include_router(meeting_router)
 # Optional: Add a health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "jobs": await db_manager.get_queue_stats(),
+        # Executor pool load of every running worker
+        "executors": await db_manager.get_executor_stats(executor_stats_cutoff())
+    }
+
+# Prometheus scrape endpoint: stage duration histograms and queue gauges
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        render_prometheus(
+            await db_manager.get_stage_histograms(),
+            await db_manager.get_queue_stats(),
+            await db_manager.get_executor_stats(executor_stats_cutoff())
+        ),
+        media_type="text/plain; version=0.0.4"
+    )
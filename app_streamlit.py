@@ -1,6 +1,6 @@
 import streamlit as st
 import requests
-import time
+import json
 import os
 from src.logger import get_formatted_logger
 
@@ -11,13 +11,30 @@ st.title("AI Meeting Minutes Generator")
 
 tab1, tab2 = st.tabs(["Upload Transcript", "Upload Audio/Video"])
 
-def process_file(file, endpoint):
+def iter_job_events(job_id):
+    """Yield the (event, data) pairs of the Server-Sent Events stream of a job"""
+    with requests.get(f"{api_url}/events/{job_id}", stream=True, timeout=(10, 60)) as response:
+        response.raise_for_status()
+        event, data = "message", []
+        for line in response.iter_lines(decode_unicode=True):
+            if line:
+                field, _, value = line.partition(":")
+                if field == "event":
+                    event = value.strip()
+                elif field == "data":
+                    data.append(value.strip())
+            elif data:
+                # A blank line ends the event, comment-only frames are keep-alives
+                yield event, json.loads("\n".join(data))
+                event, data = "message", []
+
+def process_file(file, endpoint, data=None):
     """Process file upload and handle API interaction with proper error handling"""
     try:
         logger.info(f"Uploading file to {endpoint}")
         files = {"file": file.getvalue()}
         progress_bar = st.progress(0)
-        response = requests.post(f"{api_url}/{endpoint}", files=files)
+        response = requests.post(f"{api_url}/{endpoint}", files=files, data=data)
         progress_bar.progress(20)
         if response.status_code == 200:
             job_id = response.json()["job_id"]
@@ -27,69 +44,69 @@ def process_file(file, endpoint):
             # Create a progress bar and status display
             progress_text = "Processing your file. Please wait..."
             status_placeholder = st.empty()
-            details_placeholder = st.empty()
+            minutes_placeholder = st.empty()
+            current_status = status
             
-            for i in range(100):
-                # Check status every few iterations
-                if i % 5 == 0:
-                    try:
-                        status_response = requests.get(f"{api_url}/status/{job_id}")
-                        if status_response.status_code == 200:
-                            status_data = status_response.json()
-                            current_status = status_data["status"]
-                            
-                            if current_status == "COMPLETED":
-                                progress_bar.progress(100)
-                                status_placeholder.success("Processing completed successfully!")
-                                
-                                # Get job details
-                                details_response = requests.get(f"{api_url}/details/{job_id}")
-                                if details_response.status_code == 200:
-                                    details = details_response.json()
-                                    
-                                    # Display metadata if available
-                                    if details.get("metadata"):
-                                        with st.expander("Meeting Details"):
-                                            st.json(details["metadata"])
-                                    
-                                    # Provide download links
-                                    col1, col2 = st.columns(2)
-                                    with col1:
-                                        st.markdown(f"### [Download Meeting Minutes]({api_url}/download/{job_id})")
-                                    
-                                    # Only show transcript download for media files
-                                    if endpoint == "upload/media":
-                                        with col2:
-                                            st.markdown(f"### [Download Transcript]({api_url}/download/{job_id}/transcript)")
-                                
-                                return True
+            try:
+                for event, data in iter_job_events(job_id):
+                    if event == "progress" and data.get("total"):
+                        # Transcription covers 20-80% of the bar
+                        progress_bar.progress(20 + int(60 * data["chunk"] / data["total"]))
+                        status_placeholder.text(f"{progress_text}\nStatus: {data['stage']} (chunk {data['chunk']}/{data['total']})")
+                        continue
+                    if event == "minutes":
+                        # Show the minutes as the LLM writes them
+                        partial_response = requests.get(f"{api_url}/minutes/{job_id}/partial")
+                        if partial_response.status_code == 200:
+                            minutes_placeholder.markdown(partial_response.json()["text"])
+                        continue
+                    if event != "status":
+                        continue
+                    
+                    current_status = data["status"]
+                    if current_status == "COMPLETED":
+                        progress_bar.progress(100)
+                        minutes_placeholder.empty()
+                        status_placeholder.success("Processing completed successfully!")
+                        
+                        # Get job details
+                        details_response = requests.get(f"{api_url}/details/{job_id}")
+                        if details_response.status_code == 200:
+                            details = details_response.json()
                             
-                            elif current_status == "FAILED":
-                                progress_bar.progress(100)
-                                error_msg = status_data.get("error", "Unknown error")
-                                status_placeholder.error(f"Processing failed: {error_msg}")
-                                return False
+                            # Display metadata if available
+                            if details.get("metadata"):
+                                with st.expander("Meeting Details"):
+                                    st.json(details["metadata"])
                             
-                            # Update status text with more details
-                            status_text = f"{progress_text} ({i+1}%)\nStatus: {current_status}"
-                            if status_data.get("processing_time"):
-                                status_text += f"\nElapsed: {status_data['processing_time']}s"
-                            status_placeholder.text(status_text)
+                            # Provide download links
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.markdown(f"### [Download Meeting Minutes]({api_url}/download/{job_id})")
+                                st.markdown(f"[Markdown]({api_url}/download/{job_id}?format=md) · [HTML]({api_url}/download/{job_id}?format=html) · [JSON]({api_url}/download/{job_id}?format=json)")
                             
-                        else:
-                            logger.warning(f"Status check failed: {status_response.status_code}")
+                            # Only show transcript download for media files
+                            if endpoint == "upload/media":
+                                with col2:
+                                    st.markdown(f"### [Download Transcript]({api_url}/download/{job_id}/transcript)")
+                        
+                        return True
                     
-                    except Exception as e:
-                        logger.error(f"Error checking status: {str(e)}")
-                        status_placeholder.warning(f"Status check failed: {str(e)}")
-                
-                # Update progress bar
-                progress_bar.progress(i + 1)
-                time.sleep(0.2)
+                    elif current_status == "FAILED":
+                        progress_bar.progress(100)
+                        error_msg = data.get("error") or "Unknown error"
+                        status_placeholder.error(f"Processing failed: {error_msg}")
+                        return False
+                    
+                    if current_status == "SUMMARIZING":
+                        progress_bar.progress(85)
+                    status_placeholder.text(f"{progress_text}\nStatus: {current_status}")
+            except requests.RequestException as e:
+                logger.error(f"Error reading job events: {str(e)}")
                 
-            # If we get here, we timed out
-            logger.warning(f"Job {job_id} processing timed out")
-            status_placeholder.warning("Processing is taking longer than expected. The job is still running in the background.")
+            # If we get here, the event stream was interrupted
+            logger.warning(f"Lost the event stream of job {job_id} (last status: {current_status})")
+            status_placeholder.warning("Lost track of the job progress. The job is still running in the background.")
             return False
         
         else:
@@ -136,12 +153,18 @@ with tab2:
         key="media_uploader"
     )
     
+    language = st.text_input(
+        "Spoken language (optional)",
+        placeholder="e.g. en, vi, english - detected automatically when empty",
+        key="media_language"
+    )
+    
     if media_file is not None:
         st.info(f"File selected: {media_file.name}")
         if st.button("Generate Minutes", key="media_btn"):
             with st.spinner("Processing your media file..."):
                 logger.info(f"Processing media file: {media_file.name}")
-                process_file(media_file, "upload/media")
+                process_file(media_file, "upload/media", data={"language": language} if language else None)
 
 # Add a section for job status lookup
 st.markdown("---")
@@ -0,0 +1,37 @@
+import asyncio
+import signal
+from api.services.job_worker import JobWorker, db_manager
+from src.config import GlobalConfig
+from src.executors import transcription_pool, shutdown_executors
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+global_config = GlobalConfig()
+
+async def main():
+    worker = JobWorker()
+    
+    # Start the transcription workers, which pre-load the shared Whisper model,
+    # so the first media job doesn't pay the load time
+    if global_config.WHISPER_CONFIG.preload:
+        try:
+            await transcription_pool.warm_up()
+        except Exception as e:
+            logger.warning(f"Could not pre-load Whisper model: {str(e)}")
+    
+    # Stop on Ctrl+C / SIGTERM: running jobs are handed back to the queue
+    run_task = asyncio.create_task(worker.run())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, run_task.cancel)
+    
+    try:
+        await run_task
+    except asyncio.CancelledError:
+        pass
+    finally:
+        shutdown_executors()
+        await db_manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+import json
+import os
+import random
+import resource
+import subprocess
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+def synthesize_meeting_audio(path: str, duration_seconds: float, silence_ratio: float = 0.3, seed: int = 0):
+    """Write a 16 kHz mono WAV file alternating speech-like bursts and silences.
+
+    Bursts are harmonic tones with a syllable-rate envelope and some noise,
+    so the audio has the energy profile of speech without any real words.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration_seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    position = 0
+    while position < total:
+        speech = int(rng.uniform(2, 12) * SAMPLE_RATE)
+        silence = int(speech * silence_ratio / (1 - silence_ratio)) if silence_ratio < 1 else speech
+        end = min(total, position + speech)
+        t = np.arange(end - position, dtype=np.float32) / SAMPLE_RATE
+        pitch = rng.uniform(100, 220)
+        tone = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 5))
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+        audio[position:end] = 0.2 * tone * envelope + 0.01 * rng.standard_normal(end - position)
+        position = end + silence
+    # Background noise over the silences too
+    audio += 0.002 * rng.standard_normal(total).astype(np.float32)
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+    return path
+
+def synthesize_meeting_video(path: str, audio_path: str):
+    """Mux synthesized audio with a small still video track into an MP4 file"""
+    subprocess.run([
+        "ffmpeg", "-nostdin", "-y", "-f", "lavfi", "-i", "color=c=gray:s=640x360:r=5", "-i", audio_path,
+        "-shortest", "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", path,
+    ], capture_output=True, check=True)
+    return path
+
+def synthesize_transcript(words: int, seed: int = 0) -> str:
+    """Return a meeting-like transcript of about `words` words"""
+    rng = np.random.default_rng(seed)
+    speakers = ["Alice", "Bob", "Carol", "Dave"]
+    vocabulary = (
+        "we need to ship the release next week and review the budget for the "
+        "marketing campaign before the customer meeting on friday action item "
+        "follow up with the design team about the dashboard latency numbers"
+    ).split()
+    lines = []
+    count = 0
+    while count < words:
+        length = int(rng.integers(8, 40))
+        sentence = " ".join(rng.choice(vocabulary, length))
+        lines.append(f"{rng.choice(speakers)}: {sentence.capitalize()}.")
+        count += length
+    return "\n".join(lines)
+
+def synthesize_minutes_markdown(sections: int) -> str:
+    """Return large meeting minutes in the Markdown layout the LLM produces"""
+    parts = ["# Benchmark Meeting", "", "**Date:** 2025-01-01", ""]
+    for i in range(sections):
+        parts += [
+            f"## Topic {i + 1}",
+            "",
+            f"Discussion of item {i + 1} with **bold** and *italic* text about the roadmap.",
+            "",
+            "- First point raised by the team",
+            "- Second point with a follow up",
+            "  - Nested detail",
+            "",
+            "1. Decision one",
+            "   1. Nested detail of the decision",
+            "2. Decision two",
+            "",
+            "| Owner | Action item | Due |",
+            "|-------|-------------|-----|",
+            f"| Alice | Follow up on **topic {i + 1}** | Friday |",
+            "| Bob | Review the numbers | Monday |",
+            "",
+        ]
+    return "\n".join(parts)
+
+class StubLLMServer:
+    """Local HTTP server standing in for the LLM (LLM_BACKEND=http), answering canned minutes.
+
+    Every reply takes `latency_seconds`, spread over its pieces when it is
+    streamed, and a seeded `error_rate` fraction of the requests is answered
+    with 503 to exercise the client retries.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, response: str = None, error_rate: float = 0.0, seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.response = response or synthesize_minutes_markdown(5)
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.calls += 1
+                    failed = stub._random.random() < stub.error_rate
+                    stub.errors += failed
+                if failed:
+                    lines = [json.dumps({"error": "unavailable"})]
+                elif request.get("stream"):
+                    # The reply in pieces of a few lines, one JSON object per line
+                    text_lines = stub.response.splitlines(keepends=True)
+                    lines = [json.dumps({"delta": "".join(text_lines[i:i + 4])}) for i in range(0, len(text_lines), 4)]
+                else:
+                    lines = [json.dumps({"content": stub.response})]
+                data = [(line + "\n").encode("utf-8") for line in lines]
+                self.send_response(503 if failed else 200)
+                self.send_header("Content-Type", "application/x-ndjson" if request.get("stream") else "application/json")
+                self.send_header("Content-Length", str(sum(len(piece) for piece in data)))
+                self.end_headers()
+                # The latency is spread over the pieces of a streamed reply
+                for piece in data:
+                    if stub.latency_seconds:
+                        time.sleep(stub.latency_seconds / len(data))
+                    self.wfile.write(piece)
+                    self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far, in MB"""
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(maxrss / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+@contextmanager
+def measure(disk_path: str, interval: float = 0.05):
+    """Measure wall time, peak RSS and the peak size of `disk_path` while the block runs.
+
+    Yields a dict filled in when the block exits.
+    """
+    stats: Dict[str, float] = {}
+    peak_disk = [directory_size(disk_path)]
+    baseline_disk = peak_disk[0]
+    done = threading.Event()
+
+    def sample_disk():
+        while not done.wait(interval):
+            peak_disk[0] = max(peak_disk[0], directory_size(disk_path))
+
+    sampler = threading.Thread(target=sample_disk, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["wall_seconds"] = round(time.perf_counter() - start, 4)
+        done.set()
+        sampler.join()
+        peak_disk[0] = max(peak_disk[0], directory_size(disk_path))
+        stats["peak_rss_mb"] = peak_rss_mb()
+        stats["temp_disk_peak_mb"] = round((peak_disk[0] - baseline_disk) / (1024 * 1024), 2)
@@ -0,0 +1,25 @@
+"""The HTML-splitting Word export replaced by src/flow/markdown_docx.py, kept to benchmark against"""
+import docx
+import markdown
+
+def legacy_export_to_word(meeting_minutes_markdown: str, output_path: str):
+    html_content = markdown.markdown(meeting_minutes_markdown)
+    doc = docx.Document()
+    for line in html_content.split('\n'):
+        line = line.strip()
+        if line.startswith("<h1>"):
+            doc.add_heading(line.replace("<h1>", "").replace("</h1>", ""), level=1)
+        elif line.startswith("<h2>"):
+            doc.add_heading(line.replace("<h2>", "").replace("</h2>", ""), level=2)
+        elif line.startswith("<h3>"):
+            doc.add_heading(line.replace("<h3>", "").replace("</h3>", ""), level=3)
+        elif line.startswith("<ul>") or line.startswith("<ol>"):
+            continue
+        elif line.startswith("<li>"):
+            doc.add_paragraph(line.replace("<li>", "- ").replace("</li>", ""), style="ListBullet")
+        else:
+            cleaned_line = line.replace("<p>", "").replace("</p>", "").strip()
+            if cleaned_line and not (cleaned_line.startswith("<") and cleaned_line.endswith(">")):
+                doc.add_paragraph(cleaned_line)
+    doc.save(output_path)
+    return output_path
@@ -0,0 +1,271 @@
+"""Offline benchmarks of the transcription and meeting minutes pipeline.
+
+Every case runs in a fresh process inside a scratch directory, so peak RSS
+and temp disk usage are measured per case. Whisper weights must already be
+in the local cache, the LLM is replaced by a local stub server.
+
+    python -m benchmarks.run_benchmarks --audio-seconds 300 --compare benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _setup_case(args):
+    """Point the app at the scratch directory. Runs before any `src` import of the case process"""
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("GOOGLE_MODEL", "models/gemini-2.0-flash")
+    os.environ["WHISPER_MODEL"] = args["whisper_model"]
+    os.environ["WHISPER_PRELOAD"] = "false"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["TEMP_MIN_FREE_MB"] = "0"
+    sys.path.insert(0, REPO_ROOT)
+    os.makedirs("data/temp", exist_ok=True)
+
+def _start_stub_llm(args):
+    """Serve the LLM from a local stub. Must run before `src` is imported, the client reads its settings on import"""
+    from benchmarks.bench_utils import StubLLMServer
+
+    stub = StubLLMServer(latency_seconds=args["llm_latency"], error_rate=args["llm_error_rate"]).start()
+    os.environ["LLM_BACKEND"] = "http"
+    os.environ["LLM_HTTP_URL"] = stub.url
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_RETRY_BASE_SECONDS"] = "0.05"
+    return stub
+
+def bench_split_audio(args):
+    from benchmarks.bench_utils import measure, synthesize_meeting_audio
+    from src.flow.export_transcript import load_audio_pcm, split_audio
+
+    audio_path = synthesize_meeting_audio("data/temp/meeting.wav", args["audio_seconds"])
+    with measure(".") as stats:
+        audio = load_audio_pcm(audio_path)
+        chunks = split_audio(audio)
+    stats["chunks"] = len(chunks)
+    stats["audio_seconds"] = args["audio_seconds"]
+    return stats
+
+def bench_decode_video(args):
+    from benchmarks.bench_utils import SAMPLE_RATE, measure, synthesize_meeting_audio, synthesize_meeting_video
+    from src.flow.export_transcript import load_audio_pcm
+
+    audio_path = synthesize_meeting_audio("data/temp/meeting.wav", args["audio_seconds"])
+    video_path = synthesize_meeting_video("data/temp/meeting.mp4", audio_path)
+    with measure(".") as stats:
+        audio = load_audio_pcm(video_path)
+    stats["video_mb"] = round(os.path.getsize(video_path) / (1024 * 1024), 2)
+    stats["audio_seconds"] = round(len(audio) / SAMPLE_RATE, 1)
+    return stats
+
+def bench_split_audio_on_speech(args):
+    from benchmarks.bench_utils import measure, synthesize_meeting_audio
+    from src.flow.export_transcript import load_audio_pcm, split_audio_on_speech
+
+    audio_path = synthesize_meeting_audio("data/temp/meeting.wav", args["audio_seconds"])
+    audio = load_audio_pcm(audio_path)
+    with measure(".") as stats:
+        chunks, _ = split_audio_on_speech(audio)
+    stats["chunks"] = len(chunks)
+    stats["speech_ratio"] = round(sum(len(chunk) for chunk in chunks) / len(audio), 3)
+    stats["audio_seconds"] = args["audio_seconds"]
+    return stats
+
+def bench_speech_to_text(args):
+    from benchmarks.bench_utils import measure, synthesize_meeting_audio
+    from src.flow.export_transcript import load_audio_pcm, split_audio, speech_to_text
+    from src.model_registry import whisper_registry
+
+    audio_path = synthesize_meeting_audio("data/temp/meeting.wav", args["audio_seconds"])
+    chunks = split_audio(load_audio_pcm(audio_path))
+    # Model loading is not part of the decode time
+    whisper_registry.get_model()
+    with measure(".") as stats:
+        segments = speech_to_text(chunks)
+    stats["chunks"] = len(chunks)
+    stats["segments"] = len(segments)
+    stats["transcript_chars"] = len(segments.text())
+    stats["audio_seconds"] = args["audio_seconds"]
+    stats["real_time_factor"] = round(stats["wall_seconds"] / args["audio_seconds"], 4)
+    return stats
+
+def bench_process_audio_video(args):
+    from benchmarks.bench_utils import measure, synthesize_meeting_audio
+    from src.flow.export_transcript import process_audio_video
+
+    audio_path = synthesize_meeting_audio("data/temp/meeting.wav", args["audio_seconds"])
+    with measure(".") as stats:
+        process_audio_video(audio_path)
+    stats["audio_seconds"] = args["audio_seconds"]
+    stats["real_time_factor"] = round(stats["wall_seconds"] / args["audio_seconds"], 4)
+    return stats
+
+def bench_export_meeting_minutes(args):
+    stub = _start_stub_llm(args)
+    from benchmarks.bench_utils import measure, synthesize_transcript
+    from src.flow.export_meeting_minutes import export_meeting_minutes, get_summary_chunking
+
+    transcript = synthesize_transcript(args["transcript_words"])
+    transcript_path = "data/temp/transcript.txt"
+    with open(transcript_path, "w", encoding="utf-8") as f:
+        f.write(transcript)
+    first_text = []
+    with measure(".") as stats:
+        start = time.perf_counter()
+        export_meeting_minutes(transcript_path, on_text=lambda text: first_text or first_text.append(time.perf_counter() - start))
+    stats["first_text_seconds"] = round(first_text[0], 4) if first_text else None
+    stats["transcript_words"] = args["transcript_words"]
+    stats["map_reduce"] = bool(get_summary_chunking(transcript)[0])
+    stats["llm_calls"] = stub.calls
+    stats["llm_errors"] = stub.errors
+    stats["llm_latency_seconds"] = args["llm_latency"]
+    return stats
+
+def _bench_docx(args, export):
+    from benchmarks.bench_utils import measure, synthesize_minutes_markdown
+
+    markdown_text = synthesize_minutes_markdown(args["docx_sections"])
+    with measure(".") as stats:
+        export(markdown_text, "data/temp/minutes.docx")
+    stats["markdown_chars"] = len(markdown_text)
+    stats["docx_bytes"] = os.path.getsize("data/temp/minutes.docx")
+    return stats
+
+def bench_export_to_word(args):
+    from src.flow.export_meeting_minutes import export_to_word
+
+    return _bench_docx(args, export_to_word)
+
+def bench_export_to_word_legacy(args):
+    from benchmarks.legacy_export import legacy_export_to_word
+
+    return _bench_docx(args, legacy_export_to_word)
+
+def bench_database(args):
+    import asyncio
+    from benchmarks.bench_utils import measure
+    from src.db import DatabaseManager
+
+    db_manager = DatabaseManager("data/db/benchmark.db")
+    jobs = args["db_jobs"]
+    slots = asyncio.Semaphore(args["db_concurrency"])
+
+    async def job_lifecycle(i):
+        async with slots:
+            job_id = f"job-{i}"
+            await db_manager.create_process(job_id, job_type="text", payload={"file_path": f"{job_id}.txt"})
+            await db_manager.update_process(job_id, "SUMMARIZING")
+            async with db_manager.transaction():
+                await db_manager.save_transcript(job_id, f"transcript of meeting {i} " * 200, "stub", "stub", 0, 0)
+                await db_manager.update_meeting_name(job_id, f"Meeting {i}")
+                await db_manager.update_process(job_id, "COMPLETED", result={"output_path": f"{job_id}.docx"})
+            await db_manager.get_process(job_id)
+
+    async def run():
+        try:
+            await asyncio.gather(*(job_lifecycle(i) for i in range(jobs)))
+            await db_manager.list_processes(limit=50)
+            await db_manager.list_processes(query="meeting", limit=50)
+        finally:
+            await db_manager.close()
+
+    with measure(".") as stats:
+        asyncio.run(run())
+    stats["jobs"] = jobs
+    stats["concurrency"] = args["db_concurrency"]
+    stats["jobs_per_second"] = round(jobs / stats["wall_seconds"], 1)
+    return stats
+
+CASES = {
+    "split_audio": bench_split_audio,
+    "decode_video": bench_decode_video,
+    "split_audio_on_speech": bench_split_audio_on_speech,
+    "speech_to_text": bench_speech_to_text,
+    "process_audio_video": bench_process_audio_video,
+    "export_meeting_minutes": bench_export_meeting_minutes,
+    "export_to_word": bench_export_to_word,
+    "export_to_word_legacy": bench_export_to_word_legacy,
+    "database": bench_database,
+}
+
+def _run_case(name, args):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    try:
+        os.chdir(workdir)
+        _setup_case(args)
+        from benchmarks.bench_utils import peak_rss_mb
+
+        baseline_rss = peak_rss_mb()
+        result = CASES[name](args)
+        result["baseline_rss_mb"] = baseline_rss
+        return result
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run_case(name, args):
+    """Run a benchmark case in its own process"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_run_case, name, args).result()
+
+def compare(results, baseline_path):
+    """Print the change of wall time of every case against a previous run"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("wall_seconds")
+        after = result.get("wall_seconds")
+        if before and after:
+            print(f"{name:24} {before:10.3f}s -> {after:10.3f}s ({(after - before) / before:+.1%})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--audio-seconds", type=float, default=120)
+    parser.add_argument("--whisper-model", default="tiny")
+    parser.add_argument("--transcript-words", type=int, default=20000)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per stub LLM call")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="fraction of stub LLM calls answered with 503")
+    parser.add_argument("--docx-sections", type=int, default=500)
+    parser.add_argument("--db-jobs", type=int, default=200)
+    parser.add_argument("--db-concurrency", type=int, default=20)
+    parser.add_argument("--output", help="JSON file to write, benchmarks/results/<timestamp>.json by default")
+    parser.add_argument("--compare", help="previous JSON results to compare wall times against")
+    args = parser.parse_args()
+
+    case_args = {key: value for key, value in vars(args).items() if key not in ("cases", "output", "compare")}
+    results = {}
+    for name in args.cases:
+        print(f"Running {name}...", flush=True)
+        try:
+            results[name] = run_case(name, case_args)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        print(f"  {json.dumps(results[name])}", flush=True)
+
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": case_args,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
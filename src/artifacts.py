@@ -0,0 +1,148 @@
+import contextlib
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from src.config import GlobalConfig
+from src.flow.markdown_docx import create_markdown_parser, render_markdown_to_docx
+from src.metrics import StageTimer
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+# Format: (file extension, media type)
+ARTIFACT_FORMATS = {
+    "md": ("md", "text/markdown; charset=utf-8"),
+    "docx": ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "html": ("html", "text/html; charset=utf-8"),
+    "pdf": ("pdf", "application/pdf"),
+    "json": ("json", "application/json"),
+}
+# Bump when a renderer changes, so cached artifacts are rendered again
+RENDER_VERSION = "1"
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^ *(```|~~~)")
+
+class ArtifactUnavailable(Exception):
+    """Raised when a format can't be rendered because its optional dependency is missing"""
+
+def pdf_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        # weasyprint raises OSError when its system libraries (Pango) are missing
+        return False
+    return True
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in ARTIFACT_FORMATS if fmt != "pdf" or pdf_available()]
+
+def get_artifacts_path(job_id: str) -> str:
+    """Return the directory of the rendered artifacts of a job"""
+    return os.path.join(global_config.PathConfig.output_path, "artifacts", job_id)
+
+def remove_artifacts(job_id: str):
+    path = get_artifacts_path(job_id)
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+        logger.debug(f"Removed artifacts of job {job_id}: {path}")
+
+def artifact_etag(markdown_text: str, fmt: str) -> str:
+    """ETag of a rendered artifact: a hash of the minutes, the format and the renderer version"""
+    digest = hashlib.sha256(f"{fmt}\0{RENDER_VERSION}\0".encode("utf-8"))
+    digest.update(markdown_text.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+def minutes_sections(markdown_text: str) -> List[Dict[str, object]]:
+    """Split the minutes into sections at their headings"""
+    sections = []
+    current = {"level": 0, "heading": None, "lines": []}
+    in_fence = False
+    for line in markdown_text.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            sections.append(current)
+            current = {"level": len(match.group(1)), "heading": match.group(2), "lines": []}
+        else:
+            current["lines"].append(line)
+    sections.append(current)
+    return [
+        {"level": section["level"], "heading": section["heading"], "markdown": "\n".join(section["lines"]).strip()}
+        for section in sections
+        if section["heading"] is not None or "".join(section["lines"]).strip()
+    ]
+
+def render_html(markdown_text: str, title: str) -> str:
+    body = create_markdown_parser().convert(markdown_text)
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
+
+def _render(markdown_text: str, fmt: str, output_path: str, job_id: str, meeting_name: Optional[str]):
+    title = meeting_name or "Meeting minutes"
+    if fmt == "md":
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(markdown_text)
+    elif fmt == "docx":
+        render_markdown_to_docx(markdown_text).save(output_path)
+    elif fmt == "html":
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(render_html(markdown_text, title))
+    elif fmt == "pdf":
+        if not pdf_available():
+            raise ArtifactUnavailable("PDF export needs the optional weasyprint package")
+        import weasyprint
+
+        weasyprint.HTML(string=render_html(markdown_text, title)).write_pdf(output_path)
+    elif fmt == "json":
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "job_id": job_id,
+                "meeting_name": meeting_name,
+                "markdown": markdown_text,
+                "sections": minutes_sections(markdown_text),
+            }, f, ensure_ascii=False)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+def get_artifact(job_id: str, markdown_text: str, fmt: str, meeting_name: Optional[str] = None,
+                 timer: Optional[StageTimer] = None) -> Tuple[str, str]:
+    """Return the path and ETag of the minutes of a job in `fmt`, rendering them on first request.
+
+    Artifacts are cached on disk under their ETag. They are rendered to a
+    temporary file and renamed into place, so concurrent requests never
+    see a partial file. A render is timed as a "<fmt>_export" span of `timer`.
+    """
+    try:
+        etag = artifact_etag(markdown_text, fmt)
+        directory = get_artifacts_path(job_id)
+        path = os.path.join(directory, f"{etag}.{ARTIFACT_FORMATS[fmt][0]}")
+        if os.path.exists(path):
+            return path, etag
+
+        logger.info(f"Rendering {fmt} minutes of job {job_id}")
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=f".{ARTIFACT_FORMATS[fmt][0]}.tmp")
+        os.close(fd)
+        try:
+            with timer.span(f"{fmt}_export") if timer else contextlib.nullcontext():
+                _render(markdown_text, fmt, temp_path, job_id, meeting_name)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return path, etag
+    except ArtifactUnavailable:
+        raise
+    except Exception as e:
+        logger.error(f"Error rendering {fmt} minutes of job {job_id}: {str(e)}")
+        raise
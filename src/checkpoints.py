@@ -0,0 +1,66 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+class TranscriptCheckpoint:
+    """Per-chunk progress of a transcription, stored in the transcript_chunks table.
+
+    Each decoded chunk is saved as soon as it's done, so the transcript so
+    far can be read while the job runs and a retried job only decodes the
+    chunks that are missing. Picklable and backed by plain sqlite3
+    connections, for use in the transcription worker processes.
+    """
+
+    def __init__(self, process_id: str, db_path: str = None):
+        self.process_id = process_id
+        self.db_path = db_path or global_config.DATABASE_CONFIG.db_path
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def load(self, chunk_ranges: List[Tuple[int, int]]) -> Tuple[Dict[int, List[tuple]], Optional[str]]:
+        """Return the segments of the chunks already decoded, and their language.
+
+        Chunks are only reused if the audio was split at the same sample
+        ranges; checkpoints of a different split are discarded.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT chunk_index, start_sample, end_sample, language, segments FROM transcript_chunks WHERE process_id = ?",
+                (self.process_id,)
+            ).fetchall()
+        if not rows:
+            return {}, None
+
+        if any(index >= len(chunk_ranges) or tuple(chunk_ranges[index]) != (start, end) for index, start, end, _, _ in rows):
+            logger.warning(f"Audio of job {self.process_id} was split differently, discarding its checkpoints")
+            self.clear()
+            return {}, None
+
+        completed = {index: [tuple(segment) for segment in json.loads(segments)] for index, _, _, _, segments in rows}
+        logger.info(f"Resuming transcription of job {self.process_id}: {len(completed)}/{len(chunk_ranges)} chunks already done")
+        return completed, rows[0][3]
+
+    def save_chunk(self, chunk_index: int, chunk_range: Tuple[int, int], total_chunks: int, language: Optional[str], segments: List[tuple]):
+        """Record the segments of a decoded chunk"""
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO transcript_chunks
+                    (process_id, chunk_index, start_sample, end_sample, total_chunks, language, text, segments, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                self.process_id, chunk_index, int(chunk_range[0]), int(chunk_range[1]), total_chunks, language,
+                " ".join(segment[2] for segment in segments if segment[2]), json.dumps(segments),
+                datetime.utcnow().isoformat()
+            ))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM transcript_chunks WHERE process_id = ?", (self.process_id,))
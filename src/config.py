@@ -15,10 +15,95 @@ class LLMConfig(BaseModel):
     model_name: str
     model_id: str
 
+class LLMClientConfig(BaseModel):
+    backend: str = os.environ.get('LLM_BACKEND', "gemini")  # gemini or http
+    http_url: str = os.environ.get('LLM_HTTP_URL', "http://localhost:8090")
+    timeout_seconds: float = float(os.environ.get('LLM_TIMEOUT_SECONDS', 120))
+    max_concurrency: int = int(os.environ.get('LLM_MAX_CONCURRENCY', 4))
+    requests_per_minute: float = float(os.environ.get('LLM_REQUESTS_PER_MINUTE', 60))  # 0 disables the rate limit
+    burst: int = int(os.environ.get('LLM_RATE_BURST', 4))
+    max_retries: int = int(os.environ.get('LLM_MAX_RETRIES', 4))
+    retry_base_seconds: float = float(os.environ.get('LLM_RETRY_BASE_SECONDS', 1.0))
+    retry_max_seconds: float = float(os.environ.get('LLM_RETRY_MAX_SECONDS', 30.0))
+
+class WhisperConfig(BaseModel):
+    model_size: str = os.environ.get('WHISPER_MODEL', "tiny")
+    device: str | None = os.environ.get('WHISPER_DEVICE') or None
+    memory_budget_mb: int = int(os.environ.get('WHISPER_MEMORY_BUDGET_MB', 2048))
+    batch_size: int = int(os.environ.get('WHISPER_BATCH_SIZE', 8))
+    preload: bool = os.environ.get('WHISPER_PRELOAD', "true").lower() == "true"
+    language: str | None = os.environ.get('WHISPER_LANGUAGE') or None
+    language_detect_chunks: int = int(os.environ.get('WHISPER_LANGUAGE_DETECT_CHUNKS', 3))
+
+class AudioConfig(BaseModel):
+    chunk_duration_ms: int = 30000
+    mmap_threshold_mb: int = int(os.environ.get('AUDIO_MMAP_THRESHOLD_MB', 100))
+    vad_enabled: bool = os.environ.get('AUDIO_VAD_ENABLED', "true").lower() == "true"
+    vad_threshold_db: float = float(os.environ.get('AUDIO_VAD_THRESHOLD_DB', 12))
+    vad_min_silence_ms: int = int(os.environ.get('AUDIO_VAD_MIN_SILENCE_MS', 300))
+    vad_max_pause_ms: int = int(os.environ.get('AUDIO_VAD_MAX_PAUSE_MS', 2000))
+    vad_speech_pad_ms: int = int(os.environ.get('AUDIO_VAD_SPEECH_PAD_MS', 200))
+
+class WorkspaceConfig(BaseModel):
+    min_free_mb: int = int(os.environ.get('TEMP_MIN_FREE_MB', 1024))
+    max_temp_mb: int = int(os.environ.get('TEMP_MAX_USAGE_MB', 10240))  # 0 disables the limit
+    # Failed jobs keep their workspace this long to be retried
+    failed_retention_hours: float = float(os.environ.get('TEMP_FAILED_RETENTION_HOURS', 24))
+
+class ExecutorConfig(BaseModel):
+    transcription_workers: int = int(os.environ.get('TRANSCRIPTION_WORKERS', 1))
+    llm_workers: int = int(os.environ.get('LLM_WORKERS', 4))
+    io_workers: int = int(os.environ.get('IO_WORKERS', 2))
+
+class QueueConfig(BaseModel):
+    worker_concurrency: int = int(os.environ.get('WORKER_CONCURRENCY', 2))
+    poll_interval_seconds: float = float(os.environ.get('WORKER_POLL_INTERVAL_SECONDS', 1.0))
+    lease_seconds: int = int(os.environ.get('WORKER_LEASE_SECONDS', 60))
+    max_attempts: int = int(os.environ.get('WORKER_MAX_ATTEMPTS', 3))
+
+class SummaryConfig(BaseModel):
+    # Transcripts above this size are summarized in map-reduce mode
+    map_reduce_threshold_tokens: int = int(os.environ.get('SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS', 24000))
+    chunk_tokens: int = int(os.environ.get('SUMMARY_CHUNK_TOKENS', 8000))
+    overlap_tokens: int = int(os.environ.get('SUMMARY_OVERLAP_TOKENS', 400))
+    max_concurrency: int = int(os.environ.get('SUMMARY_MAX_CONCURRENCY', 4))
+    streaming: bool = os.environ.get('SUMMARY_STREAMING', "true").lower() == "true"
+    stream_flush_seconds: float = float(os.environ.get('SUMMARY_STREAM_FLUSH_SECONDS', 0.5))
+
+class CacheConfig(BaseModel):
+    enabled: bool = os.environ.get('LLM_CACHE_ENABLED', "true").lower() == "true"
+    db_path: str = os.environ.get('LLM_CACHE_DB_PATH', "data/db/llm_cache.db")
+    ttl_hours: int = int(os.environ.get('LLM_CACHE_TTL_HOURS', 168))
+    max_entries: int = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 1000))
+
+class UploadConfig(BaseModel):
+    chunk_size_kb: int = int(os.environ.get('UPLOAD_CHUNK_SIZE_KB', 1024))
+    max_text_mb: int = int(os.environ.get('UPLOAD_MAX_TEXT_MB', 20))
+    max_media_mb: int = int(os.environ.get('UPLOAD_MAX_MEDIA_MB', 2048))
+
+class DatabaseConfig(BaseModel):
+    db_path: str = "data/db/summaries.db"
+    pool_size: int = int(os.environ.get('DB_POOL_SIZE', 5))
+
+class EventConfig(BaseModel):
+    poll_interval_seconds: float = float(os.environ.get('EVENTS_POLL_INTERVAL_SECONDS', 0.5))
+    keepalive_seconds: int = int(os.environ.get('EVENTS_KEEPALIVE_SECONDS', 15))
+
 class GlobalConfig:
     GEMINI_CONFIG = LLMConfig(
         api_key=os.environ.get('GOOGLE_API_KEY'),
         model_name="Gemini",
         model_id=os.environ.get('GOOGLE_MODEL')
     )
+    LLM_CLIENT_CONFIG = LLMClientConfig()
+    WHISPER_CONFIG = WhisperConfig()
+    AUDIO_CONFIG = AudioConfig()
+    WORKSPACE_CONFIG = WorkspaceConfig()
+    EXECUTOR_CONFIG = ExecutorConfig()
+    QUEUE_CONFIG = QueueConfig()
+    SUMMARY_CONFIG = SummaryConfig()
+    CACHE_CONFIG = CacheConfig()
+    UPLOAD_CONFIG = UploadConfig()
+    DATABASE_CONFIG = DatabaseConfig()
+    EVENT_CONFIG = EventConfig()
     PathConfig = PathConfig()
@@ -1,26 +1,97 @@
 import os
+import asyncio
 import aiosqlite
+import base64
+import hashlib
 import json
+import sqlite3  # Use sync sqlite3 for initialization only
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 import logging
 from contextlib import asynccontextmanager
+from src.config import GlobalConfig
+from src.metrics import bucket_for
 
 logger = logging.getLogger(__name__)
 
+global_config = GlobalConfig()
+
+class ConnectionPool:
+    """A small pool of long-lived aiosqlite connections to one database file.
+
+    Reusing connections keeps sqlite3's per-connection statement cache warm,
+    so repeated queries run as prepared statements.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self.size = size
+        self._idle: List[aiosqlite.Connection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        # Connection of the transaction running in the current task, if any
+        self.transaction: ContextVar[Optional[aiosqlite.Connection]] = ContextVar(f"transaction:{db_path}", default=None)
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = aiosqlite.connect(self.db_path, timeout=30, cached_statements=256)
+        # Don't keep the interpreter alive for a connection that was never closed
+        conn.daemon = True
+        conn = await conn
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection, waiting when all of them are in use"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores are bound to the event loop that first uses them
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size)
+        
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield conn
+            except BaseException:
+                # Don't hand out a connection with a half-done transaction
+                try:
+                    await conn.rollback()
+                except Exception:
+                    await conn.close()
+                    raise
+                self._idle.append(conn)
+                raise
+            else:
+                self._idle.append(conn)
+
+    async def close(self):
+        while self._idle:
+            await self._idle.pop().close()
+
 class DatabaseManager:
-    def __init__(self, db_path: str = "data/db/summaries.db"):
+    # Pools are shared by every manager of the same database file
+    _pools: Dict[str, ConnectionPool] = {}
+
+    def __init__(self, db_path: str = None):
+        db_path = db_path or global_config.DATABASE_CONFIG.db_path
         self.db_path = db_path
         output_db = os.path.dirname(db_path)
         os.makedirs(output_db, exist_ok=True)
         self._init_db()
+        if db_path not in self._pools:
+            self._pools[db_path] = ConnectionPool(db_path, global_config.DATABASE_CONFIG.pool_size)
+        self._pool = self._pools[db_path]
 
     def _init_db(self):
         """Initialize the database with required tables"""
-        import sqlite3  # Use sync sqlite3 for initialization only
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            # WAL lets status polls read while jobs write, the setting is stored in the database file
+            cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS summary_processes (
                     id TEXT PRIMARY KEY,
@@ -33,9 +104,23 @@ class DatabaseManager:
                     end_time TEXT,
                     chunk_count INTEGER DEFAULT 0,
                     processing_time REAL DEFAULT 0.0,
-                    metadata TEXT
+                    metadata TEXT,
+                    job_type TEXT,
+                    payload TEXT,
+                    claimed_by TEXT,
+                    lease_expires_at TEXT,
+                    heartbeat_at TEXT,
+                    attempts INTEGER DEFAULT 0
                 )
             """)
+            self._add_missing_columns(cursor, "summary_processes", {
+                "job_type": "TEXT",
+                "payload": "TEXT",
+                "claimed_by": "TEXT",
+                "lease_expires_at": "TEXT",
+                "heartbeat_at": "TEXT",
+                "attempts": "INTEGER DEFAULT 0",
+            })
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS transcripts (
                     process_id TEXT PRIMARY KEY,
@@ -49,32 +134,371 @@ class DatabaseManager:
                     FOREIGN KEY (process_id) REFERENCES summary_processes(id)
                 )
             """)
+            self._add_missing_columns(cursor, "transcripts", {
+                "transcript_hash": "TEXT",
+                "transcript_bytes": "INTEGER",
+            })
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transcript_segments (
+                    process_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    start REAL NOT NULL,
+                    end REAL NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (process_id, seq)
+                ) WITHOUT ROWID
+            """)
+            # Decoded chunks of a running transcription, kept until its transcript is saved
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transcript_chunks (
+                    process_id TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    start_sample INTEGER NOT NULL,
+                    end_sample INTEGER NOT NULL,
+                    total_chunks INTEGER NOT NULL,
+                    language TEXT,
+                    text TEXT NOT NULL,
+                    segments TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (process_id, chunk_index)
+                ) WITHOUT ROWID
+            """)
+            # Minutes of a job, written as the LLM streams them until `complete`
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS meeting_minutes (
+                    process_id TEXT PRIMARY KEY,
+                    markdown TEXT NOT NULL,
+                    complete INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS media_fingerprints (
+                    media_hash TEXT PRIMARY KEY,
+                    process_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (process_id) REFERENCES summary_processes(id)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    process_id TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    data TEXT,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_events_process_id ON job_events (process_id, id)")
+            # Stage duration histograms: one counter per bucket (not cumulative) and a count/sum per stage
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stage_metrics (
+                    stage TEXT NOT NULL,
+                    le REAL NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (stage, le)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stage_metric_totals (
+                    stage TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    sum REAL NOT NULL DEFAULT 0
+                )
+            """)
+            # Executor pool load, reported periodically by each worker process
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS executor_stats (
+                    worker_id TEXT NOT NULL,
+                    pool TEXT NOT NULL,
+                    workers INTEGER NOT NULL,
+                    in_flight INTEGER NOT NULL,
+                    queued INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (worker_id, pool)
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_summary_processes_status ON summary_processes (status, created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_summary_processes_created_at ON summary_processes (created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_meeting_name ON transcripts (meeting_name)")
+            self.full_text_search = self._init_full_text_search(cursor)
             conn.commit()
 
+    @staticmethod
+    def _init_full_text_search(cursor) -> bool:
+        """Create the FTS5 index over transcripts, kept in sync by triggers. Returns False if FTS5 is unavailable"""
+        exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'transcripts_fts'").fetchone()
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts
+                USING fts5(meeting_name, transcript_text, content='transcripts', content_rowid='rowid')
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search disabled, SQLite has no FTS5 support: {str(e)}")
+            return False
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transcripts_fts_insert AFTER INSERT ON transcripts BEGIN
+                INSERT INTO transcripts_fts (rowid, meeting_name, transcript_text)
+                VALUES (new.rowid, new.meeting_name, new.transcript_text);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transcripts_fts_delete AFTER DELETE ON transcripts BEGIN
+                INSERT INTO transcripts_fts (transcripts_fts, rowid, meeting_name, transcript_text)
+                VALUES ('delete', old.rowid, old.meeting_name, old.transcript_text);
+            END
+        """)
+        update_trigger = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'transcripts_fts_update'").fetchone()
+        if update_trigger and "UPDATE OF" not in update_trigger[0]:
+            # Created before the trigger was limited to the indexed columns
+            cursor.execute("DROP TRIGGER transcripts_fts_update")
+        # Only the indexed columns: updating the hash or size of a transcript doesn't re-index its text
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transcripts_fts_update AFTER UPDATE OF meeting_name, transcript_text ON transcripts BEGIN
+                INSERT INTO transcripts_fts (transcripts_fts, rowid, meeting_name, transcript_text)
+                VALUES ('delete', old.rowid, old.meeting_name, old.transcript_text);
+                INSERT INTO transcripts_fts (rowid, meeting_name, transcript_text)
+                VALUES (new.rowid, new.meeting_name, new.transcript_text);
+            END
+        """)
+        if not exists:
+            # Index the transcripts saved before full-text search was added
+            cursor.execute("INSERT INTO transcripts_fts (transcripts_fts) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _add_missing_columns(cursor, table: str, columns: Dict[str, str]):
+        """Add columns introduced after a database was first created"""
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
     @asynccontextmanager
     async def _get_connection(self):
-        """Get a new database connection"""
-        conn = await aiosqlite.connect(self.db_path)
-        try:
+        """Get a pooled database connection, or the one of the running transaction"""
+        conn = self._pool.transaction.get()
+        if conn is not None:
             yield conn
-        finally:
-            await conn.close()
+            return
+        async with self._pool.connection() as conn:
+            yield conn
+
+    async def _commit(self, conn):
+        # Writes made inside `transaction()` are committed together when it ends
+        if self._pool.transaction.get() is None:
+            await conn.commit()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Batch the writes of several DatabaseManager calls into a single commit"""
+        if self._pool.transaction.get() is not None:
+            yield
+            return
+        async with self._pool.connection() as conn:
+            token = self._pool.transaction.set(conn)
+            try:
+                yield
+                await conn.commit()
+            finally:
+                self._pool.transaction.reset(token)
 
-    async def create_process(self,process_id) -> str:
-        """Create a new process entry and return its ID"""
+    async def close(self):
+        """Close the pooled connections"""
+        await self._pool.close()
+
+    async def create_process(self, process_id, job_type: Optional[str] = None, payload: Optional[Dict] = None) -> str:
+        """Create a new process entry and return its ID.
+
+        Processes created with a `job_type` are queued for the job workers.
+        """
         if not process_id:
             process_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         
         async with self._get_connection() as conn:
             await conn.execute(
-                "INSERT INTO summary_processes (id, status, created_at, updated_at, start_time) VALUES (?, ?, ?, ?, ?)",
-                (process_id, "PENDING", now, now, now)
+                "INSERT INTO summary_processes (id, status, created_at, updated_at, start_time, job_type, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (process_id, "PENDING", now, now, now, job_type, json.dumps(payload) if payload else None)
             )
-            await conn.commit()
+            await self._add_job_event(conn, process_id, "status", {"status": "PENDING"}, now)
+            await self._commit(conn)
         
         return process_id
 
+    async def claim_next_job(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """Claim the oldest queued job, or a job whose previous worker stopped heartbeating"""
+        now = datetime.utcnow()
+        lease_expires_at = (now + timedelta(seconds=lease_seconds)).isoformat()
+        now = now.isoformat()
+        
+        async with self._get_connection() as conn:
+            # Take the write lock up front so two workers can't claim the same job
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                async with conn.execute("""
+                    SELECT id, job_type, payload, attempts FROM summary_processes
+                    WHERE job_type IS NOT NULL
+                      AND status NOT IN ('COMPLETED', 'FAILED')
+                      AND (claimed_by IS NULL OR lease_expires_at < ?)
+                    ORDER BY created_at
+                    LIMIT 1
+                """, (now,)) as cursor:
+                    row = await cursor.fetchone()
+                
+                if not row:
+                    await conn.rollback()
+                    return None
+                
+                await conn.execute("""
+                    UPDATE summary_processes
+                    SET claimed_by = ?, lease_expires_at = ?, heartbeat_at = ?, attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                """, (worker_id, lease_expires_at, now, now, row[0]))
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+        
+        return {
+            "id": row[0],
+            "job_type": row[1],
+            "payload": json.loads(row[2]) if row[2] else {},
+            "attempts": (row[3] or 0) + 1,
+        }
+
+    async def heartbeat_job(self, process_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend the lease of a claimed job. Returns False if the worker no longer owns it"""
+        now = datetime.utcnow()
+        lease_expires_at = (now + timedelta(seconds=lease_seconds)).isoformat()
+        
+        async with self._get_connection() as conn:
+            cursor = await conn.execute(
+                "UPDATE summary_processes SET heartbeat_at = ?, lease_expires_at = ? WHERE id = ? AND claimed_by = ?",
+                (now.isoformat(), lease_expires_at, process_id, worker_id)
+            )
+            await self._commit(conn)
+            return cursor.rowcount > 0
+
+    async def release_job(self, process_id: str, worker_id: str):
+        """Give a claimed job back to the queue"""
+        async with self._get_connection() as conn:
+            await conn.execute(
+                "UPDATE summary_processes SET claimed_by = NULL, lease_expires_at = NULL WHERE id = ? AND claimed_by = ?",
+                (process_id, worker_id)
+            )
+            await self._commit(conn)
+
+    async def requeue_job(self, process_id: str) -> bool:
+        """Queue a failed job again. Returns False if the job is not a failed queued job"""
+        now = datetime.utcnow().isoformat()
+        async with self._get_connection() as conn:
+            cursor = await conn.execute("""
+                UPDATE summary_processes
+                SET status = 'PENDING', error = NULL, end_time = NULL, claimed_by = NULL, lease_expires_at = NULL,
+                    attempts = 0, updated_at = ?
+                WHERE id = ? AND status = 'FAILED' AND job_type IS NOT NULL
+            """, (now, process_id))
+            if cursor.rowcount:
+                await self._add_job_event(conn, process_id, "status", {"status": "PENDING"}, now)
+            await self._commit(conn)
+            return cursor.rowcount > 0
+
+    async def get_expired_failed_jobs(self, process_ids: List[str], failed_before: str) -> List[str]:
+        """Return the IDs among `process_ids` of the jobs that failed before the `failed_before` timestamp"""
+        if not process_ids:
+            return []
+        async with self._get_connection() as conn:
+            async with conn.execute(f"""
+                SELECT id FROM summary_processes
+                WHERE status = 'FAILED' AND updated_at < ? AND id IN ({", ".join("?" * len(process_ids))})
+            """, (failed_before, *process_ids)) as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
+    async def get_job_payload(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """Get the payload a queued job was created with"""
+        async with self._get_connection() as conn:
+            async with conn.execute("SELECT payload FROM summary_processes WHERE id = ?", (process_id,)) as cursor:
+                row = await cursor.fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    async def get_queue_stats(self) -> Dict[str, int]:
+        """Count queued and in-flight jobs"""
+        now = datetime.utcnow().isoformat()
+        async with self._get_connection() as conn:
+            async with conn.execute("""
+                SELECT
+                    SUM(CASE WHEN claimed_by IS NULL OR lease_expires_at < ? THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN claimed_by IS NOT NULL AND lease_expires_at >= ? THEN 1 ELSE 0 END)
+                FROM summary_processes
+                WHERE job_type IS NOT NULL AND status NOT IN ('COMPLETED', 'FAILED')
+            """, (now, now)) as cursor:
+                row = await cursor.fetchone()
+        return {"queued": row[0] or 0, "in_flight": row[1] or 0}
+
+    async def save_executor_stats(self, worker_id: str, stats: Dict[str, Dict[str, int]], expired_before: str):
+        """Replace the executor pool stats of a worker, and drop the stats of workers that stopped reporting before `expired_before`"""
+        now = datetime.utcnow().isoformat()
+        async with self._get_connection() as conn:
+            await conn.execute("DELETE FROM executor_stats WHERE updated_at < ?", (expired_before,))
+            await conn.executemany("""
+                INSERT OR REPLACE INTO executor_stats (worker_id, pool, workers, in_flight, queued, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(worker_id, pool, s["workers"], s["in_flight"], s["queued"], now) for pool, s in stats.items()])
+            await self._commit(conn)
+
+    async def delete_executor_stats(self, worker_id: str):
+        async with self._get_connection() as conn:
+            await conn.execute("DELETE FROM executor_stats WHERE worker_id = ?", (worker_id,))
+            await self._commit(conn)
+
+    async def get_executor_stats(self, updated_after: str) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Get the executor pool stats reported since `updated_after`, as {worker_id: {pool: {"workers", "in_flight", "queued"}}}"""
+        stats = {}
+        async with self._get_connection() as conn:
+            async with conn.execute("""
+                SELECT worker_id, pool, workers, in_flight, queued FROM executor_stats WHERE updated_at >= ?
+            """, (updated_after,)) as cursor:
+                async for worker_id, pool, workers, in_flight, queued in cursor:
+                    stats.setdefault(worker_id, {})[pool] = {"workers": workers, "in_flight": in_flight, "queued": queued}
+        return stats
+
+    async def record_stage_timings(self, observations: Dict[str, List[float]]):
+        """Add the stage durations of a job to the stage histograms"""
+        bucket_counts = {}
+        for stage, values in observations.items():
+            for seconds in values:
+                key = (stage, bucket_for(seconds))
+                bucket_counts[key] = bucket_counts.get(key, 0) + 1
+        if not bucket_counts:
+            return
+        
+        async with self._get_connection() as conn:
+            await conn.executemany("""
+                INSERT INTO stage_metrics (stage, le, count) VALUES (?, ?, ?)
+                ON CONFLICT (stage, le) DO UPDATE SET count = count + excluded.count
+            """, [(stage, le, count) for (stage, le), count in bucket_counts.items()])
+            await conn.executemany("""
+                INSERT INTO stage_metric_totals (stage, count, sum) VALUES (?, ?, ?)
+                ON CONFLICT (stage) DO UPDATE SET count = count + excluded.count, sum = sum + excluded.sum
+            """, [(stage, len(values), sum(values)) for stage, values in observations.items() if values])
+            await self._commit(conn)
+
+    async def get_stage_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get the stage histograms as {stage: {"buckets": {le: count}, "count", "sum"}}"""
+        histograms = {}
+        async with self._get_connection() as conn:
+            async with conn.execute("SELECT stage, count, sum FROM stage_metric_totals") as cursor:
+                async for row in cursor:
+                    histograms[row[0]] = {"buckets": {}, "count": row[1], "sum": row[2]}
+            async with conn.execute("SELECT stage, le, count FROM stage_metrics") as cursor:
+                async for row in cursor:
+                    if row[0] in histograms:
+                        histograms[row[0]]["buckets"][row[1]] = row[2]
+        return histograms
+
     async def update_process(self, process_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None, 
                            chunk_count: Optional[int] = None, processing_time: Optional[float] = None, 
                            metadata: Optional[Dict] = None):
@@ -107,7 +531,44 @@ class DatabaseManager:
             params.append(process_id)
             query = f"UPDATE summary_processes SET {', '.join(update_fields)} WHERE id = ?"
             await conn.execute(query, params)
-            await conn.commit()
+            await self._add_job_event(conn, process_id, "status", {"status": status, "error": error}, now)
+            await self._commit(conn)
+
+    @staticmethod
+    async def _add_job_event(conn, process_id: str, event: str, data: Dict, now: str):
+        await conn.execute(
+            "INSERT INTO job_events (process_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+            (process_id, event, json.dumps(data), now)
+        )
+
+    async def add_job_event(self, process_id: str, event: str, data: Dict):
+        """Record a progress event of a job for the event streams"""
+        async with self._get_connection() as conn:
+            await self._add_job_event(conn, process_id, event, data, datetime.utcnow().isoformat())
+            await self._commit(conn)
+
+    async def get_job_events(self, process_ids: List[str], after_id: int = 0) -> List[Dict[str, Any]]:
+        """Get the events of some jobs recorded after the event `after_id`"""
+        if not process_ids:
+            return []
+        placeholders = ", ".join("?" for _ in process_ids)
+        async with self._get_connection() as conn:
+            async with conn.execute(f"""
+                SELECT id, process_id, event, data FROM job_events
+                WHERE id > ? AND process_id IN ({placeholders})
+                ORDER BY id
+            """, (after_id, *process_ids)) as cursor:
+                rows = await cursor.fetchall()
+        return [
+            {"id": row[0], "job_id": row[1], "event": row[2], "data": json.loads(row[3]) if row[3] else {}}
+            for row in rows
+        ]
+
+    async def get_last_job_event_id(self) -> int:
+        async with self._get_connection() as conn:
+            async with conn.execute("SELECT MAX(id) FROM job_events") as cursor:
+                row = await cursor.fetchone()
+        return row[0] or 0
 
     async def get_process(self, process_id: str) -> Optional[Dict[str, Any]]:
         """Get a process by its ID"""
@@ -145,12 +606,21 @@ class DatabaseManager:
                             chunk_size: int, overlap: int):
         """Save transcript data"""
         now = datetime.utcnow().isoformat()
+        # Hash and UTF-8 size let downloads be validated and ranged without reading the text
+        transcript_bytes = transcript_text.encode("utf-8")
+        transcript_hash = hashlib.sha256(transcript_bytes).hexdigest()
         async with self._get_connection() as conn:
+            # Upsert: a job re-run after a worker crash may already have saved its transcript.
+            # (INSERT OR REPLACE would skip the delete trigger keeping the full-text index in sync)
             await conn.execute("""
-                INSERT INTO transcripts (process_id, transcript_text, model, model_name, chunk_size, overlap, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (process_id, transcript_text, model, model_name, chunk_size, overlap, now))
-            await conn.commit()
+                INSERT INTO transcripts (process_id, transcript_text, transcript_hash, transcript_bytes, model, model_name, chunk_size, overlap, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (process_id) DO UPDATE SET
+                    transcript_text = excluded.transcript_text, transcript_hash = excluded.transcript_hash,
+                    transcript_bytes = excluded.transcript_bytes, model = excluded.model, model_name = excluded.model_name,
+                    chunk_size = excluded.chunk_size, overlap = excluded.overlap, created_at = excluded.created_at
+            """, (process_id, transcript_text, transcript_hash, len(transcript_bytes), model, model_name, chunk_size, overlap, now))
+            await self._commit(conn)
 
     async def update_meeting_name(self, process_id: str, meeting_name: str):
         """Update meeting name for a transcript"""
@@ -158,7 +628,7 @@ class DatabaseManager:
             await conn.execute("""
                 UPDATE transcripts SET meeting_name = ? WHERE process_id = ?
             """, (meeting_name, process_id))
-            await conn.commit()
+            await self._commit(conn)
 
     async def get_transcript_data(self, process_id: str):
         """Get transcript data for a process"""
@@ -174,13 +644,253 @@ class DatabaseManager:
                     return dict(zip([col[0] for col in cursor.description], row))
                 return None
 
-    async def cleanup_old_processes(self, hours: int = 24):
-        """Clean up processes older than specified hours"""
+    async def get_transcript_info(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """Get the meeting name, hash and UTF-8 size of a transcript, without its text.
+
+        Transcripts saved before the hash was stored get it computed here once.
+        """
+        async with self._get_connection() as conn:
+            async with conn.execute("""
+                SELECT meeting_name, transcript_hash, transcript_bytes FROM transcripts WHERE process_id = ?
+            """, (process_id,)) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                return None
+            meeting_name, transcript_hash, transcript_bytes = row
+            
+            if transcript_hash is None:
+                async with conn.execute("SELECT transcript_text FROM transcripts WHERE process_id = ?", (process_id,)) as cursor:
+                    text = (await cursor.fetchone())[0].encode("utf-8")
+                transcript_hash, transcript_bytes = hashlib.sha256(text).hexdigest(), len(text)
+                await conn.execute("""
+                    UPDATE transcripts SET transcript_hash = ?, transcript_bytes = ? WHERE process_id = ?
+                """, (transcript_hash, transcript_bytes, process_id))
+                await self._commit(conn)
+            return {"meeting_name": meeting_name, "transcript_hash": transcript_hash, "transcript_bytes": transcript_bytes}
+
+    def iter_transcript_bytes(self, process_id: str, offset: int = 0, length: Optional[int] = None,
+                              chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield a byte range of the UTF-8 transcript text in chunks, the whole text by default.
+
+        The text is read incrementally with SQLite blob I/O on a plain sqlite3
+        connection, so only one chunk is in memory at a time. Blocking: meant
+        to be iterated in a thread, as StreamingResponse does with generators.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            row = conn.execute("SELECT rowid FROM transcripts WHERE process_id = ?", (process_id,)).fetchone()
+            if not row:
+                return
+            with conn.blobopen("transcripts", "transcript_text", row[0], readonly=True) as blob:
+                end = len(blob) if length is None else min(len(blob), offset + length)
+                blob.seek(min(offset, end))
+                while blob.tell() < end:
+                    yield blob.read(min(chunk_size, end - blob.tell()))
+        finally:
+            conn.close()
+
+    async def save_transcript_segments(self, process_id: str, rows: List[tuple]):
+        """Replace the timestamped segments of a transcript with (seq, start, end, chunk_index, text) rows"""
+        async with self._get_connection() as conn:
+            await conn.execute("DELETE FROM transcript_segments WHERE process_id = ?", (process_id,))
+            await conn.executemany(
+                "INSERT INTO transcript_segments (process_id, seq, start, end, chunk_index, text) VALUES (?, ?, ?, ?, ?, ?)",
+                [(process_id, *row) for row in rows]
+            )
+            await self._commit(conn)
+
+    async def get_transcript_segments(self, process_id: str, start: Optional[float] = None,
+                                      end: Optional[float] = None) -> List[tuple]:
+        """Get the (start, end, chunk_index, text) segments of a transcript overlapping [start, end] seconds"""
+        conditions = ["process_id = ?"]
+        params = [process_id]
+        if start is not None:
+            conditions.append("end > ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("start < ?")
+            params.append(end)
+        async with self._get_connection() as conn:
+            async with conn.execute(
+                f"SELECT start, end, chunk_index, text FROM transcript_segments WHERE {' AND '.join(conditions)} ORDER BY seq",
+                params
+            ) as cursor:
+                return await cursor.fetchall()
+
+    async def get_transcript_chunks(self, process_id: str) -> List[tuple]:
+        """Get the (chunk_index, total_chunks, text) chunks transcribed so far by a running job"""
+        async with self._get_connection() as conn:
+            async with conn.execute(
+                "SELECT chunk_index, total_chunks, text FROM transcript_chunks WHERE process_id = ? ORDER BY chunk_index",
+                (process_id,)
+            ) as cursor:
+                return await cursor.fetchall()
+
+    async def delete_transcript_chunks(self, process_id: str):
+        async with self._get_connection() as conn:
+            await conn.execute("DELETE FROM transcript_chunks WHERE process_id = ?", (process_id,))
+            await self._commit(conn)
+
+    async def save_meeting_minutes(self, process_id: str, markdown: str):
+        """Save the finished minutes of a job"""
+        now = datetime.utcnow().isoformat()
+        async with self._get_connection() as conn:
+            await conn.execute("""
+                INSERT INTO meeting_minutes (process_id, markdown, complete, updated_at) VALUES (?, ?, 1, ?)
+                ON CONFLICT (process_id) DO UPDATE SET markdown = excluded.markdown, complete = 1, updated_at = excluded.updated_at
+            """, (process_id, markdown, now))
+            await self._commit(conn)
+
+    async def get_meeting_minutes(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """Get the minutes of a job, complete or as streamed so far"""
+        async with self._get_connection() as conn:
+            async with conn.execute(
+                "SELECT markdown, complete, updated_at FROM meeting_minutes WHERE process_id = ?",
+                (process_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return None
+        return {"markdown": row[0], "complete": bool(row[1]), "updated_at": row[2]}
+
+    async def save_media_fingerprint(self, media_hash: str, process_id: str):
+        """Record the job that transcribed the media file with this SHA-256"""
+        now = datetime.utcnow().isoformat()
+        async with self._get_connection() as conn:
+            await conn.execute(
+                "INSERT OR REPLACE INTO media_fingerprints (media_hash, process_id, created_at) VALUES (?, ?, ?)",
+                (media_hash, process_id, now)
+            )
+            await self._commit(conn)
+
+    async def find_media_fingerprint(self, media_hash: str) -> Optional[Dict[str, Any]]:
+        """Find the job that transcribed the media file with this SHA-256, along with its status and whether its minutes are complete"""
+        async with self._get_connection() as conn:
+            async with conn.execute("""
+                SELECT f.process_id, p.status, p.result, t.transcript_text, m.complete
+                FROM media_fingerprints f
+                JOIN transcripts t ON t.process_id = f.process_id
+                LEFT JOIN summary_processes p ON p.id = f.process_id
+                LEFT JOIN meeting_minutes m ON m.process_id = f.process_id
+                WHERE f.media_hash = ?
+            """, (media_hash,)) as cursor:
+                row = await cursor.fetchone()
+                if not row:
+                    return None
+                return {
+                    "process_id": row[0],
+                    "status": row[1],
+                    "result": json.loads(row[2]) if row[2] else None,
+                    "transcript_text": row[3],
+                    "minutes_complete": bool(row[4]),
+                }
+
+    @staticmethod
+    def _encode_cursor(created_at: str, process_id: str) -> str:
+        return base64.urlsafe_b64encode(f"{created_at}|{process_id}".encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            created_at, process_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        except Exception:
+            raise ValueError("Invalid cursor")
+        return created_at, process_id
+
+    async def list_processes(self, status: Optional[str] = None, created_after: Optional[str] = None,
+                             created_before: Optional[str] = None, meeting_name: Optional[str] = None,
+                             query: Optional[str] = None, cursor: Optional[str] = None,
+                             limit: int = 50) -> Dict[str, Any]:
+        """List processes, newest first, with keyset pagination.
+
+        `meeting_name` matches names starting with the given text and `query`
+        runs a full-text search over transcripts. Pass the returned
+        `next_cursor` to get the following page.
+        """
+        conditions = []
+        params: List[Any] = []
+        if status:
+            conditions.append("p.status = ?")
+            params.append(status)
+        if created_after:
+            conditions.append("p.created_at >= ?")
+            params.append(created_after)
+        if created_before:
+            conditions.append("p.created_at < ?")
+            params.append(created_before)
+        if meeting_name:
+            # Prefix range instead of LIKE so the meeting_name index is used
+            conditions.append("t.meeting_name >= ? AND t.meeting_name < ?")
+            params.extend([meeting_name, meeting_name + "\U0010ffff"])
+        if query:
+            if not self.full_text_search:
+                raise ValueError("Full-text search is not available")
+            # Quote every term so user input can't break the FTS5 query syntax
+            fts_query = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+            conditions.append("t.rowid IN (SELECT rowid FROM transcripts_fts WHERE transcripts_fts MATCH ?)")
+            params.append(fts_query)
+        if cursor:
+            cursor_created_at, cursor_id = self._decode_cursor(cursor)
+            conditions.append("(p.created_at < ? OR (p.created_at = ? AND p.id < ?))")
+            params.extend([cursor_created_at, cursor_created_at, cursor_id])
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit + 1)
+        async with self._get_connection() as conn:
+            async with conn.execute(f"""
+                SELECT p.id, p.status, p.job_type, p.created_at, p.updated_at, p.processing_time, p.error, t.meeting_name
+                FROM summary_processes p
+                LEFT JOIN transcripts t ON t.process_id = p.id
+                {where}
+                ORDER BY p.created_at DESC, p.id DESC
+                LIMIT ?
+            """, params) as db_cursor:
+                rows = await db_cursor.fetchall()
+        
+        items = [
+            {
+                "job_id": row[0],
+                "status": row[1],
+                "job_type": row[2],
+                "created_at": row[3],
+                "updated_at": row[4],
+                "processing_time": row[5],
+                "error": row[6],
+                "meeting_name": row[7],
+            }
+            for row in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self._encode_cursor(items[-1]["created_at"], items[-1]["job_id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def cleanup_old_processes(self, hours: int = 24) -> List[str]:
+        """Clean up processes older than specified hours and return their IDs"""
         cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
         
         async with self._get_connection() as conn:
+            async with conn.execute(
+                "SELECT id FROM summary_processes WHERE created_at < ?",
+                (cutoff,)
+            ) as cursor:
+                process_ids = [row[0] for row in await cursor.fetchall()]
             await conn.execute(
                 "DELETE FROM summary_processes WHERE created_at < ?",
                 (cutoff,)
             )
-            await conn.commit()
\ No newline at end of file
+            await conn.execute(
+                "DELETE FROM job_events WHERE created_at < ?",
+                (cutoff,)
+            )
+            await conn.execute(
+                "DELETE FROM transcript_segments WHERE process_id NOT IN (SELECT id FROM summary_processes)"
+            )
+            await conn.execute(
+                "DELETE FROM transcript_chunks WHERE process_id NOT IN (SELECT id FROM summary_processes)"
+            )
+            await conn.execute(
+                "DELETE FROM meeting_minutes WHERE process_id NOT IN (SELECT id FROM summary_processes)"
+            )
+            await self._commit(conn)
+        return process_ids
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+from src.config import GlobalConfig
+from src.db import DatabaseManager
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+def record_job_event(process_id: str, event: str, data: Dict, db_path: str = None):
+    """Record a job event with a plain sqlite3 connection.
+
+    Used from the transcription worker processes, which have no event loop
+    and can't share the pooled connections of the job worker.
+    """
+    with sqlite3.connect(db_path or global_config.DATABASE_CONFIG.db_path, timeout=30) as conn:
+        conn.execute(
+            "INSERT INTO job_events (process_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+            (process_id, event, json.dumps(data), datetime.utcnow().isoformat())
+        )
+
+class ChunkProgressReporter:
+    """Picklable progress callback publishing 'chunk i of N' events of a job"""
+
+    def __init__(self, process_id: str, stage: str = "TRANSCRIBING"):
+        self.process_id = process_id
+        self.stage = stage
+
+    def __call__(self, done: int, total: int):
+        try:
+            record_job_event(self.process_id, "progress", {"stage": self.stage, "chunk": done, "total": total})
+        except Exception as e:
+            # Progress is best effort, never fail the job because of it
+            logger.warning(f"Could not record progress of job {self.process_id}: {str(e)}")
+
+class PartialMinutesBuffer:
+    """Stream callback saving the minutes written so far by the LLM.
+
+    The text is written to the meeting_minutes table, with a "minutes" event
+    of its length, at most every `flush_seconds` so long replies don't turn
+    every token into a database write.
+    """
+
+    def __init__(self, process_id: str, flush_seconds: float = None, db_path: str = None):
+        self.process_id = process_id
+        self.flush_seconds = global_config.SUMMARY_CONFIG.stream_flush_seconds if flush_seconds is None else flush_seconds
+        self.db_path = db_path or global_config.DATABASE_CONFIG.db_path
+        self._last_flush = 0.0
+
+    def __call__(self, text: str):
+        now = time.monotonic()
+        if now - self._last_flush < self.flush_seconds:
+            return
+        self._last_flush = now
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.execute("""
+                    INSERT INTO meeting_minutes (process_id, markdown, complete, updated_at) VALUES (?, ?, 0, ?)
+                    ON CONFLICT (process_id) DO UPDATE SET markdown = excluded.markdown, complete = 0, updated_at = excluded.updated_at
+                """, (self.process_id, text, datetime.utcnow().isoformat()))
+            record_job_event(self.process_id, "minutes", {"stage": "SUMMARIZING", "chars": len(text)}, self.db_path)
+        except Exception as e:
+            # Best effort like the progress events, the finished minutes are saved by the job
+            logger.warning(f"Could not save the partial minutes of job {self.process_id}: {str(e)}")
+
+class JobEventBus:
+    """In-process pub/sub of job events for the event streams.
+
+    Jobs run in worker processes and record their events in the job_events
+    table. While there are subscribers, a single relay task reads the new
+    events of all watched jobs and fans them out to the subscriber queues.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, poll_interval: float):
+        self.db_manager = db_manager
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._relay_task: Optional[asyncio.Task] = None
+        self._last_id = 0
+
+    async def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Return a queue receiving the events of `job_id` recorded from now on"""
+        if self._relay_task is None or self._relay_task.done():
+            last_id = await self.db_manager.get_last_job_event_id()
+            if self._relay_task is None or self._relay_task.done():
+                self._last_id = last_id
+                self._relay_task = asyncio.create_task(self._relay())
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(job_id)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job_id]
+
+    def publish(self, event: Dict):
+        for queue in self._subscribers.get(event["job_id"], ()):
+            queue.put_nowait(event)
+
+    async def _relay(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._subscribers:
+                return
+            try:
+                events = await self.db_manager.get_job_events(list(self._subscribers), self._last_id)
+                for event in events:
+                    self._last_id = event["id"]
+                    self.publish(event)
+            except Exception as e:
+                logger.error(f"Error relaying job events: {str(e)}")
+
+    async def close(self):
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._relay_task = None
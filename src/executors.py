@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+def _init_transcription_worker(num_threads: int, preload: bool):
+    """Initializer of transcription worker processes"""
+    import torch
+    from src.model_registry import whisper_registry
+
+    # Split the cores between worker processes instead of oversubscribing them
+    torch.set_num_threads(num_threads)
+    if preload:
+        # A failing initializer breaks the whole pool, let the first job retry the load instead
+        try:
+            whisper_registry.get_model()
+        except Exception as e:
+            logger.warning(f"Could not pre-load Whisper model in worker {os.getpid()}: {str(e)}")
+
+def _warm_up():
+    return os.getpid()
+
+class ExecutorPool:
+    """Runs blocking callables off the event loop and keeps track of the queue depth"""
+
+    def __init__(self, name: str, max_workers: int, factory: Callable[[], Executor]):
+        self.name = name
+        self.max_workers = max_workers
+        self._factory = factory
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def executor(self) -> Executor:
+        # Created lazily so importing this module never spawns workers
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting {self.name} executor with {self.max_workers} workers")
+                self._executor = self._factory()
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        self._in_flight += 1
+        try:
+            return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # A worker died (OOM kill, segfault): the pool is unusable, the next call starts a fresh one
+            logger.error(f"A {self.name} worker died, restarting the {self.name} executor")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            raise
+        finally:
+            self._in_flight -= 1
+
+    async def warm_up(self):
+        """Start every worker ahead of the first job"""
+        await asyncio.gather(*(self.run(_warm_up) for _ in range(self.max_workers)))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.max_workers),
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+_executor_config = global_config.EXECUTOR_CONFIG
+_threads_per_transcription_worker = max(1, (os.cpu_count() or 1) // _executor_config.transcription_workers)
+
+# Whisper and audio decoding are CPU bound: run them in separate processes
+transcription_pool = ExecutorPool(
+    "transcription",
+    _executor_config.transcription_workers,
+    lambda: ProcessPoolExecutor(
+        max_workers=_executor_config.transcription_workers,
+        # spawn instead of fork: torch doesn't survive forking a process with running threads
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_transcription_worker,
+        initargs=(_threads_per_transcription_worker, global_config.WHISPER_CONFIG.preload),
+    ),
+)
+# LLM calls mostly wait on the network
+llm_pool = ExecutorPool(
+    "llm",
+    _executor_config.llm_workers,
+    lambda: ThreadPoolExecutor(max_workers=_executor_config.llm_workers, thread_name_prefix="llm"),
+)
+# Document generation and other blocking file work
+io_pool = ExecutorPool(
+    "io",
+    _executor_config.io_workers,
+    lambda: ThreadPoolExecutor(max_workers=_executor_config.io_workers, thread_name_prefix="io"),
+)
+
+ALL_POOLS = (transcription_pool, llm_pool, io_pool)
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {pool.name: pool.stats() for pool in ALL_POOLS}
+
+def shutdown_executors():
+    for pool in ALL_POOLS:
+        pool.shutdown()
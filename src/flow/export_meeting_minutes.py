@@ -1,10 +1,19 @@
 import os
-import docx
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from src.config import GlobalConfig
-from src.prompts import INSTRUCTIONS_CREATE_MEETING_MINUTES, SYSTEM_PROMPT, EXAMPLE_OUTPUT
-from llama_index.llms.gemini import Gemini
+from src.llm_cache import llm_cache
+from src.llm_client import llm_client
+from src.flow.markdown_docx import render_markdown_to_docx
+from src.prompts import (
+    INSTRUCTIONS_CREATE_MEETING_MINUTES,
+    INSTRUCTIONS_MERGE_MEETING_MINUTES,
+    INSTRUCTIONS_SUMMARIZE_TRANSCRIPT_CHUNK,
+    SYSTEM_PROMPT,
+    EXAMPLE_OUTPUT,
+)
 from llama_index.core.llms import ChatMessage
-import markdown
 from dotenv import load_dotenv
 load_dotenv()
 from src.logger import get_formatted_logger
@@ -12,22 +21,136 @@ logger = get_formatted_logger(__name__)
 
 global_config = GlobalConfig()
 
-def _extract_response(response):
-    """Extract text from model response."""
-    try:
-        logger.debug("Extracting response from LLM")
-        if hasattr(response, 'text'):
-            return response.text
-        elif hasattr(response, 'content'):
-            return response.content.parts[0].text
-        else:
-            return response.message.content
-    except Exception as e:
-        logger.warning(f"Exception while extracting response: {str(e)}")
-        return response.message.content
+CHARS_PER_TOKEN = 4
+_cache_stats_lock = threading.Lock()
+
+def _estimate_tokens(text):
+    """Rough token count of a text (about 4 characters per token)"""
+    return len(text) // CHARS_PER_TOKEN
+
+def get_summary_chunking(transcript_text):
+    """Return the (chunk_size, overlap) in tokens used to summarize a transcript, (0, 0) for a single pass"""
+    summary_config = global_config.SUMMARY_CONFIG
+    if _estimate_tokens(transcript_text) <= summary_config.map_reduce_threshold_tokens:
+        return 0, 0
+    return summary_config.chunk_tokens, summary_config.overlap_tokens
+
+def split_transcript(transcript_text, chunk_tokens, overlap_tokens):
+    """Split a transcript on word boundaries into chunks of about `chunk_tokens` tokens.
+
+    Each chunk starts with the last `overlap_tokens` tokens of the previous one.
+    """
+    chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    overlap_chars = overlap_tokens * CHARS_PER_TOKEN
+    words = transcript_text.split()
+    chunks = []
+    start = 0
+    
+    while start < len(words):
+        end = start
+        length = 0
+        while end < len(words) and (length + len(words[end]) + 1 <= chunk_chars or end == start):
+            length += len(words[end]) + 1
+            end += 1
+        chunks.append(" ".join(words[start:end]))
+        if end >= len(words):
+            break
+        
+        # Step back over the overlap, always moving forward by at least one word
+        next_start = end
+        overlap = 0
+        while next_start > start + 1 and overlap + len(words[next_start - 1]) + 1 <= overlap_chars:
+            next_start -= 1
+            overlap += len(words[next_start]) + 1
+        start = next_start
+    
+    return chunks
+
+def _chat(messages, cache_stats=None, timer=None, on_text=None):
+    """Call the LLM, answering from the response cache when the same request was made before.
+
+    Calls that reach the LLM are timed as "llm_call" spans of `timer` when given.
+    With `on_text`, the reply is streamed and `on_text` is called with the
+    text received so far.
+    """
+    cache_key = None
+    if llm_cache is not None:
+        model_id = llm_client.model_id
+        cache_key = llm_cache.make_key(model_id, messages)
+        cached = llm_cache.get(cache_key)
+        _count_cache_lookup(cache_stats, "hits" if cached is not None else "misses")
+        if cached is not None:
+            logger.info("LLM response served from cache")
+            if on_text:
+                on_text(cached)
+            return cached
+    
+    with timer.span("llm_call") if timer else contextlib.nullcontext():
+        response = llm_client.stream_chat(messages, on_text) if on_text else llm_client.chat(messages)
+    if cache_key is not None:
+        llm_cache.set(cache_key, model_id, response)
+    return response
+
+def _count_cache_lookup(cache_stats, counter):
+    if cache_stats is not None:
+        with _cache_stats_lock:
+            cache_stats[counter] = cache_stats.get(counter, 0) + 1
 
-def export_meeting_minutes(transcript_path):
-    """Process transcript into meeting minutes"""
+def _minutes_messages(transcript_text):
+    return [
+        ChatMessage(
+            role="system", content=SYSTEM_PROMPT
+        ),
+        ChatMessage(
+            role="system", content=INSTRUCTIONS_CREATE_MEETING_MINUTES
+        ),
+        ChatMessage(
+            role="assistant", content=EXAMPLE_OUTPUT
+        ),
+        ChatMessage(role="user", content="Meeting transcript text: " + transcript_text),
+    ]
+
+def _summarize_chunk(index, total, chunk_text, cache_stats, timer):
+    logger.info(f"Summarizing transcript chunk {index + 1}/{total}")
+    messages = [
+        ChatMessage(role="system", content=SYSTEM_PROMPT),
+        ChatMessage(role="system", content=INSTRUCTIONS_SUMMARIZE_TRANSCRIPT_CHUNK),
+        ChatMessage(role="user", content=f"Meeting transcript part {index + 1} of {total}: " + chunk_text),
+    ]
+    return _chat(messages, cache_stats, timer)
+
+def _map_reduce_minutes(transcript_text, chunk_tokens, overlap_tokens, cache_stats, timer, on_text):
+    """Summarize transcript chunks concurrently, then merge the notes into meeting minutes"""
+    chunks = split_transcript(transcript_text, chunk_tokens, overlap_tokens)
+    logger.info(f"Transcript split into {len(chunks)} chunks of ~{chunk_tokens} tokens ({overlap_tokens} tokens overlap)")
+    
+    with ThreadPoolExecutor(max_workers=global_config.SUMMARY_CONFIG.max_concurrency) as executor:
+        notes = list(executor.map(
+            lambda item: _summarize_chunk(item[0], len(chunks), item[1], cache_stats, timer),
+            enumerate(chunks)
+        ))
+    
+    logger.info("Merging chunk notes into meeting minutes")
+    merged_notes = "\n\n".join(f"## Part {i + 1}\n{note}" for i, note in enumerate(notes))
+    messages = [
+        ChatMessage(role="system", content=SYSTEM_PROMPT),
+        ChatMessage(role="system", content=INSTRUCTIONS_CREATE_MEETING_MINUTES),
+        ChatMessage(role="system", content=INSTRUCTIONS_MERGE_MEETING_MINUTES),
+        ChatMessage(role="assistant", content=EXAMPLE_OUTPUT),
+        ChatMessage(role="user", content="Meeting notes by transcript part: " + merged_notes),
+    ]
+    return _chat(messages, cache_stats, timer, on_text)
+
+def export_meeting_minutes(transcript_path, cache_stats=None, timer=None, on_text=None):
+    """Process transcript into meeting minutes.
+
+    Transcripts above the map-reduce threshold are summarized chunk by chunk
+    and the chunk notes are merged into the final minutes. Cache hits and
+    misses are counted in `cache_stats` when a dict is given, and LLM calls
+    are timed with `timer` when a StageTimer is given. When `on_text` is
+    given, the final minutes are streamed and `on_text` is called with the
+    minutes written so far.
+    """
     try:
         logger.info(f"Generating meeting minutes from transcript: {transcript_path}")
         # Read transcript file
@@ -36,30 +159,14 @@ def export_meeting_minutes(transcript_path):
         
         logger.info(f"Transcript loaded, length: {len(transcript_text)} characters")
         
-        # Use LlamaIndex and GPT to summarize
-        logger.info(f"Initializing LLM with model: {global_config.GEMINI_CONFIG.model_id}")
-        llm = Gemini(
-            model=os.environ.get('GOOGLE_MODEL'),
-            api_key=os.environ.get('GOOGLE_API_KEY')  # Corrected from using model as API key
-        )
-        
-        messages = [
-            ChatMessage(
-                role="system", content=SYSTEM_PROMPT
-            ),
-            ChatMessage(
-                role="system", content=INSTRUCTIONS_CREATE_MEETING_MINUTES
-            ),
-            ChatMessage(
-                role="assistant", content=EXAMPLE_OUTPUT
-            ),
-            ChatMessage(role="user", content="Meeting transcript text: " + transcript_text),
-        ]
-        
-        logger.info("Calling LLM to generate meeting minutes")
-        resp = llm.chat(messages)
+        chunk_tokens, overlap_tokens = get_summary_chunking(transcript_text)
+        if chunk_tokens:
+            logger.info("Calling LLM to generate meeting minutes in map-reduce mode")
+            minutes = _map_reduce_minutes(transcript_text, chunk_tokens, overlap_tokens, cache_stats, timer, on_text)
+        else:
+            logger.info("Calling LLM to generate meeting minutes")
+            minutes = _chat(_minutes_messages(transcript_text), cache_stats, timer, on_text)
         
-        minutes = _extract_response(resp)
         logger.info(f"Meeting minutes generated, length: {len(minutes)} characters")
         
         return minutes
@@ -70,33 +177,8 @@ def export_meeting_minutes(transcript_path):
 def export_to_word(meeting_minutes_markdown: str, output_path: str = None):
     """Export meeting minutes in Markdown format to a Word (.docx) file."""
     try:
-        logger.info("Converting markdown to HTML for Word export")
-        # Convert Markdown to HTML
-        html_content = markdown.markdown(meeting_minutes_markdown)
-        
-        # Create a new Word document
-        logger.info("Creating Word document")
-        doc = docx.Document()
-        
-        # Split the converted HTML into lines and process them
-        logger.debug("Processing markdown content into Word format")
-        for line in html_content.split('\n'):
-            line = line.strip()
-            if line.startswith("<h1>"):
-                doc.add_heading(line.replace("<h1>", "").replace("</h1>", ""), level=1)
-            elif line.startswith("<h2>"):
-                doc.add_heading(line.replace("<h2>", "").replace("</h2>", ""), level=2)
-            elif line.startswith("<h3>"):
-                doc.add_heading(line.replace("<h3>", "").replace("</h3>", ""), level=3)
-            elif line.startswith("<ul>") or line.startswith("<ol>"):
-                continue  # Ignore opening list tags
-            elif line.startswith("<li>"):
-                doc.add_paragraph(line.replace("<li>", "- ").replace("</li>", ""), style="ListBullet")
-            else:
-                # Skip empty paragraphs and HTML tags
-                cleaned_line = line.replace("<p>", "").replace("</p>", "").strip()
-                if cleaned_line and not (cleaned_line.startswith("<") and cleaned_line.endswith(">")):
-                    doc.add_paragraph(cleaned_line)
+        logger.info("Rendering markdown to a Word document")
+        doc = render_markdown_to_docx(meeting_minutes_markdown)
         
         # Save the document
         if not output_path:
@@ -110,4 +192,4 @@ def export_to_word(meeting_minutes_markdown: str, output_path: str = None):
         return output_path
     except Exception as e:
         logger.error(f"Error exporting to Word: {str(e)}")
-        raise
\ No newline at end of file
+        raise
@@ -1,37 +1,66 @@
-from pydub import AudioSegment
+import numpy as np
+import subprocess
+import torch
 import whisper
+from whisper.audio import SAMPLE_RATE
+from whisper.tokenizer import get_tokenizer
+import itertools
 import os
+import time
 from src.config import GlobalConfig
+from src.metrics import StageTimer
+from src.languages import normalize_language
+from src.segments import SegmentStore
+from src.model_registry import whisper_registry
 from src.logger import get_formatted_logger
 
 logger = get_formatted_logger(__name__)
 
 global_config = GlobalConfig()
 
-def extract_audio_from_video(video_path):
+def load_audio_pcm(audio_path, mmap_path=None):
+    """Decode an audio file once to 16 kHz mono float32 PCM.
+
+    Videos are read the same way: ffmpeg demuxes their first audio track and
+    skips the video stream, without any intermediate audio file. The samples
+    are kept in memory, or written to `mmap_path` and memory-mapped when a
+    path is given (used for long recordings).
+    """
     try:
-        logger.info(f"Extracting audio from video: {video_path}")
-        audio = AudioSegment.from_file(video_path, format="mp4")
-        audio_path = video_path.replace('.mp4', '.mp3')
-        audio.export(audio_path, format="mp3")
-        logger.info(f"Audio extracted successfully to: {audio_path}")
-        return audio_path
+        logger.info(f"Decoding audio to {SAMPLE_RATE} Hz mono PCM: {audio_path}")
+        cmd = [
+            "ffmpeg", "-nostdin", "-threads", "0", "-i", audio_path,
+            "-vn", "-map", "0:a:0",
+            "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(SAMPLE_RATE),
+        ]
+        if mmap_path:
+            subprocess.run(cmd + ["-y", mmap_path], capture_output=True, check=True)
+            # copy-on-write keeps the mapping writable for torch without touching the file
+            audio = np.memmap(mmap_path, dtype=np.float32, mode="c")
+        else:
+            with subprocess.Popen(cmd + ["-"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+                buffer = bytearray()
+                while data := proc.stdout.read(1 << 20):
+                    buffer.extend(data)
+            if proc.returncode != 0:
+                raise RuntimeError(f"ffmpeg exited with code {proc.returncode} while decoding {audio_path}")
+            audio = np.frombuffer(buffer, dtype=np.float32)
+        
+        logger.info(f"Audio decoded: {len(audio) / SAMPLE_RATE:.1f} seconds")
+        return audio
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error decoding audio: {e.stderr.decode(errors='ignore')}")
+        raise RuntimeError(f"Failed to decode audio: {audio_path}") from e
     except Exception as e:
-        logger.error(f"Error extracting audio from video: {str(e)}")
+        logger.error(f"Error decoding audio: {str(e)}")
         raise
 
-def split_audio(audio_path, chunk_duration=30000):
+def split_audio(audio, chunk_duration=30000):
+    """Split decoded PCM samples into chunks of `chunk_duration` ms (views, no copies)"""
     try:
-        logger.info(f"Splitting audio file: {audio_path} into {chunk_duration}ms chunks")
-        audio = AudioSegment.from_file(audio_path)
-        chunks = []
-        
-        for i in range(0, len(audio), chunk_duration):
-            chunk = audio[i:i+chunk_duration]
-            chunk_path = os.path.join(global_config.PathConfig.tempt_path, f"chunk_{i//chunk_duration}.mp3")
-            chunk.export(chunk_path, format="mp3")
-            chunks.append(chunk_path)
-            logger.debug(f"Created chunk {i//chunk_duration} at {chunk_path}")
+        logger.info(f"Splitting audio into {chunk_duration}ms chunks")
+        chunk_samples = chunk_duration * SAMPLE_RATE // 1000
+        chunks = [audio[i:i + chunk_samples] for i in range(0, len(audio), chunk_samples)]
         
         logger.info(f"Audio split into {len(chunks)} chunks")
         return chunks
@@ -39,56 +68,261 @@ def split_audio(audio_path, chunk_duration=30000):
         logger.error(f"Error splitting audio: {str(e)}")
         raise
 
-def speech_to_text(audio_chunks):
+VAD_FRAME_MS = 30
+VAD_MIN_SPEECH_MS = 250
+VAD_BLOCK_FRAMES = 20000  # Frames per block when computing energies, bounds the temporary arrays
+
+def _frame_energy_db(audio, frame_samples):
+    """Return the RMS level in dBFS of every frame of `frame_samples` samples"""
+    frame_count = len(audio) // frame_samples
+    energy = np.empty(frame_count, dtype=np.float32)
+    for start in range(0, frame_count, VAD_BLOCK_FRAMES):
+        end = min(frame_count, start + VAD_BLOCK_FRAMES)
+        frames = np.asarray(audio[start * frame_samples:end * frame_samples]).reshape(end - start, frame_samples)
+        energy[start:end] = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20 * np.log10(energy + 1e-10)
+
+def detect_speech_chunks(audio, max_chunk_ms=30000, threshold_db=None, min_silence_ms=None, max_pause_ms=None, speech_pad_ms=None):
+    """Find the speech in PCM samples and pack it into chunks of at most `max_chunk_ms`.
+
+    Frames louder than the noise floor by `threshold_db` are speech. Speech
+    separated by less than `min_silence_ms` of silence forms one segment, and
+    consecutive segments are packed into a chunk as long as it fits and the
+    pause between them is shorter than `max_pause_ms`. Longer pauses are left
+    out of every chunk. Segments longer than a chunk are cut at their quietest
+    frame. Returns the (start, end) sample range of each chunk.
+    """
+    audio_config = global_config.AUDIO_CONFIG
+    threshold_db = audio_config.vad_threshold_db if threshold_db is None else threshold_db
+    min_silence_ms = min_silence_ms or audio_config.vad_min_silence_ms
+    max_pause_ms = max_pause_ms or audio_config.vad_max_pause_ms
+    speech_pad_ms = audio_config.vad_speech_pad_ms if speech_pad_ms is None else speech_pad_ms
+
+    frame_samples = SAMPLE_RATE * VAD_FRAME_MS // 1000
+    energy_db = _frame_energy_db(audio, frame_samples)
+    if not len(energy_db):
+        return []
+
+    # Adaptive threshold: above the noise floor, but never above the level of quiet speech
+    noise_floor, loud = np.percentile(energy_db, [10, 95])
+    threshold = max(min(noise_floor + threshold_db, loud - 20), -60)
+    is_speech = energy_db > threshold
+
+    # Speech segments in frames, merged over short silences
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], is_speech, [False])).astype(np.int8)))
+    segments = []
+    min_silence_frames = max(1, min_silence_ms // VAD_FRAME_MS)
+    for start, end in zip(edges[::2], edges[1::2]):
+        if segments and start - segments[-1][1] < min_silence_frames:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+    min_speech_frames = VAD_MIN_SPEECH_MS // VAD_FRAME_MS
+    pad_frames = speech_pad_ms // VAD_FRAME_MS
+    segments = [
+        (max(0, start - pad_frames), min(len(energy_db), end + pad_frames))
+        for start, end in segments if end - start >= min_speech_frames
+    ]
+
+    # Pack the segments into chunks, cutting long segments at their quietest frame
+    max_frames = max_chunk_ms // VAD_FRAME_MS
+    max_pause_frames = max_pause_ms // VAD_FRAME_MS
+    search_frames = max(1, max_frames // 6)
+    chunks = []
+    for start, end in segments:
+        if chunks and start - chunks[-1][1] <= max_pause_frames and end - chunks[-1][0] <= max_frames:
+            chunks[-1][1] = max(chunks[-1][1], end)
+            continue
+        if chunks:
+            # Padding can reach back into the previous chunk: never decode the same samples twice
+            start = max(start, chunks[-1][1])
+            if start >= end:
+                continue
+        while end - start > max_frames:
+            window = energy_db[start + max_frames - search_frames:start + max_frames]
+            cut = start + max_frames - search_frames + int(np.argmin(window))
+            chunks.append([start, cut])
+            start = cut
+        chunks.append([start, end])
+
+    ranges = [(start * frame_samples, end * frame_samples) for start, end in chunks]
+    # The samples after the last full frame belong to the last chunk if it reaches them
+    if ranges and chunks[-1][1] == len(energy_db):
+        ranges[-1] = (ranges[-1][0], len(audio))
+    return ranges
+
+def split_audio_on_speech(audio, chunk_duration=30000):
+    """Split decoded PCM samples into speech chunks of at most `chunk_duration` ms (views, no copies).
+
+    Returns the chunks and their start offsets in seconds.
+    """
     try:
-        logger.info("Starting speech-to-text conversion")
-        transcript = ""
-        stt_model = whisper.load_model("tiny")
-        logger.info("Whisper model loaded")
+        logger.info(f"Splitting audio into speech chunks of at most {chunk_duration}ms")
+        ranges = detect_speech_chunks(audio, chunk_duration)
+        chunks = [audio[start:end] for start, end in ranges]
         
-        for i, chunk_path in enumerate(audio_chunks):
-            logger.debug(f"Processing chunk {i+1}/{len(audio_chunks)}: {chunk_path}")
-            # load audio and pad/trim it to fit 30 seconds
-            audio = whisper.load_audio(chunk_path)
-            audio = whisper.pad_or_trim(audio)
-            
-            # make log-Mel spectrogram and move to the same device as the model
-            mel = whisper.log_mel_spectrogram(audio, n_mels=stt_model.dims.n_mels).to(stt_model.device)
+        speech_samples = sum(end - start for start, end in ranges)
+        logger.info(f"Audio split into {len(chunks)} speech chunks, {1 - speech_samples / max(1, len(audio)):.0%} of silence skipped")
+        return chunks, [start / SAMPLE_RATE for start, _ in ranges]
+    except Exception as e:
+        logger.error(f"Error splitting audio on speech: {str(e)}")
+        raise
+
+def _chunk_to_mel(chunk, n_mels):
+    # pad/trim the samples to fit 30 seconds
+    audio = whisper.pad_or_trim(torch.from_numpy(np.ascontiguousarray(chunk)))
+    
+    # make log-Mel spectrogram
+    return whisper.log_mel_spectrogram(audio, n_mels=n_mels)
+
+TIMESTAMP_RESOLUTION = 0.02  # Seconds per Whisper timestamp token
+LANGUAGE_DETECT_MIN_DB = -50  # Quieter chunks are skipped when detecting the language
+
+def detect_language(stt_model, audio_chunks, max_chunks=None):
+    """Detect the spoken language on the first `max_chunks` chunks holding speech.
+
+    The language probabilities of these chunks are summed and the most likely
+    language is returned, None when no chunk holds speech.
+    """
+    if not stt_model.is_multilingual:
+        return "en"
+    max_chunks = max_chunks or global_config.WHISPER_CONFIG.language_detect_chunks
+    
+    speech_chunks = (
+        chunk for chunk in audio_chunks
+        if len(chunk) and 20 * np.log10(np.sqrt(np.mean(np.square(chunk, dtype=np.float32))) + 1e-10) > LANGUAGE_DETECT_MIN_DB
+    )
+    sample = list(itertools.islice(speech_chunks, max_chunks))
+    if not sample:
+        return None
+    
+    mel = torch.stack([_chunk_to_mel(chunk, stt_model.dims.n_mels) for chunk in sample]).to(stt_model.device)
+    _, probs = stt_model.detect_language(mel)
+    if isinstance(probs, dict):
+        probs = [probs]
+    totals = {}
+    for chunk_probs in probs:
+        for code, probability in chunk_probs.items():
+            totals[code] = totals.get(code, 0.0) + probability
+    language = max(totals, key=totals.get)
+    logger.info(f"Detected language '{language}' on {len(sample)} chunks ({totals[language] / len(sample):.0%} confidence)")
+    return language
+
+def _result_segments(result, tokenizer, chunk_index, offset, chunk_seconds):
+    """Split a decoding result into segments at its timestamp tokens.
+
+    Whisper brackets each segment with timestamp tokens relative to the
+    start of the chunk: <|0.00|> text <|2.40|><|2.40|> text <|5.00|>.
+    """
+    segments = []
+    segment_start = 0.0
+    text_tokens = []
+    for token in result.tokens:
+        if token >= tokenizer.timestamp_begin:
+            timestamp = min((token - tokenizer.timestamp_begin) * TIMESTAMP_RESOLUTION, chunk_seconds)
+            if text_tokens:
+                segments.append((offset + segment_start, offset + timestamp, tokenizer.decode(text_tokens).strip(), chunk_index))
+                text_tokens = []
+            segment_start = timestamp
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+    if text_tokens:
+        # Text after the last timestamp runs to the end of the chunk
+        segments.append((offset + segment_start, offset + chunk_seconds, tokenizer.decode(text_tokens).strip(), chunk_index))
+    return segments
+
+def speech_to_text(audio_chunks, batch_size=None, progress_callback=None, timer=None, language=None, chunk_offsets=None,
+                   completed_chunks=None, chunk_callback=None):
+    """Transcribe audio chunks into a SegmentStore of timestamped segments.
+
+    `chunk_offsets` are the start times in seconds of the chunks in the
+    recording, by default the chunks are taken as back to back. The
+    language is detected once on the first chunks, unless given, and every
+    chunk is decoded in that language.
+
+    Chunks whose segments are given in `completed_chunks` (by chunk index)
+    are not decoded again. `chunk_callback(index, segments, resumed, language)`
+    is called for every chunk in order, as soon as it's available, and
+    `progress_callback(done, total)` after each batch. Each decoded chunk is
+    timed as a "chunk_decode" span of `timer` when given, the time of a
+    batch being shared evenly between its chunks.
+    """
+    try:
+        batch_size = batch_size or global_config.WHISPER_CONFIG.batch_size
+        completed_chunks = completed_chunks or {}
+        logger.info(f"Starting speech-to-text conversion with batch size {batch_size}")
+        if chunk_offsets is None:
+            chunk_offsets = np.concatenate(([0], np.cumsum([len(chunk) for chunk in audio_chunks[:-1]]))) / SAMPLE_RATE
+        stt_model = whisper_registry.get_model()
+        logger.info("Whisper model ready")
+        language = language or normalize_language(global_config.WHISPER_CONFIG.language) or detect_language(stt_model, audio_chunks)
+        options = whisper.DecodingOptions(language=language, fp16=stt_model.device.type != "cpu")
+        tokenizer = get_tokenizer(stt_model.is_multilingual, num_languages=stt_model.num_languages, language=language, task=options.task)
+        segments = SegmentStore(language=language)
+        chunk_segments = dict(completed_chunks)
+        pending = []
+        emitted = 0
+        
+        for index in range(len(audio_chunks)):
+            if index not in completed_chunks:
+                pending.append(index)
+            if len(pending) < batch_size and index < len(audio_chunks) - 1:
+                continue
             
-            # detect the spoken language
-            _, probs = stt_model.detect_language(mel)
-            detected_language = max(probs, key=probs.get)
-            logger.debug(f"Detected language for chunk {i+1}: {detected_language}")
+            if pending:
+                batch_start = time.perf_counter()
+                logger.debug(f"Processing chunks {pending[0]+1}-{pending[-1]+1}/{len(audio_chunks)}")
+                
+                # stack the log-Mel spectrograms into one (N, n_mels, 3000) tensor on the model device
+                mel = torch.stack([_chunk_to_mel(audio_chunks[i], stt_model.dims.n_mels) for i in pending]).to(stt_model.device)
+                
+                # decode the whole batch at once
+                results = whisper.decode(stt_model, mel, options)
+                if timer:
+                    chunk_seconds = (time.perf_counter() - batch_start) / len(pending)
+                    for _ in pending:
+                        timer.add("chunk_decode", chunk_seconds)
+                
+                for i, result in zip(pending, results):
+                    chunk_segments[i] = _result_segments(result, tokenizer, i, float(chunk_offsets[i]), len(audio_chunks[i]) / SAMPLE_RATE)
+                    logger.debug(f"Transcribed chunk {i+1} into {len(chunk_segments[i])} segments")
+                pending = []
             
-            # decode the audio
-            options = whisper.DecodingOptions()
-            result = whisper.decode(stt_model, mel, options)
+            # Hand over the chunks in order, decoded or resumed
+            for i in range(emitted, index + 1):
+                for segment in chunk_segments[i]:
+                    segments.append(*segment)
+                if chunk_callback:
+                    chunk_callback(i, chunk_segments.pop(i), i in completed_chunks, language)
+            emitted = index + 1
             
-            chunk_transcript = result.text
-            transcript += chunk_transcript + " "
-            logger.debug(f"Transcribed chunk {i+1}, added {len(chunk_transcript)} characters")
+            if progress_callback:
+                progress_callback(emitted, len(audio_chunks))
         
-        logger.info(f"Speech-to-text conversion completed. Total transcript length: {len(transcript)} characters")
-        return transcript
+        logger.info(f"Speech-to-text conversion completed: {len(segments)} segments")
+        return segments
     except Exception as e:
         logger.error(f"Error in speech-to-text conversion: {str(e)}")
         raise
 
-def process_audio_video(file_path):
+def _chunk_ranges(audio_chunks, chunk_offsets):
+    """Return the (start, end) sample range of each chunk in the recording"""
+    if chunk_offsets is None:
+        starts = np.concatenate(([0], np.cumsum([len(chunk) for chunk in audio_chunks[:-1]]))).astype(int)
+    else:
+        starts = [round(offset * SAMPLE_RATE) for offset in chunk_offsets]
+    return [(int(start), int(start) + len(chunk)) for start, chunk in zip(starts, audio_chunks)]
+
+def _transcribe_media(file_path, progress_callback=None, timer=None, language=None, checkpoint=None):
+    """Transcribe a media file and return the path of the plain transcript with the segments.
+
+    The transcript file is appended to chunk by chunk. With a
+    TranscriptCheckpoint, every decoded chunk is also saved to the database
+    and the chunks saved by a previous attempt are not decoded again.
+    """
     try:
+        timer = timer or StageTimer()
         logger.info(f"Starting audio/video processing for: {file_path}")
-        if file_path.endswith('.mp4'):
-            logger.info("Detected video file, extracting audio")
-            audio_path = extract_audio_from_video(file_path)
-        else:
-            logger.info("Using audio file directly")
-            audio_path = file_path
-        
-        logger.info("Splitting audio into chunks")
-        audio_chunks = split_audio(audio_path)
-        
-        logger.info("Converting speech to text")
-        transcript = speech_to_text(audio_chunks)
         
         transcript_path = os.path.join(
             global_config.PathConfig.output_path,
@@ -98,13 +332,64 @@ def process_audio_video(file_path):
         # Ensure the parent directory exists, NOT the file itself
         output_dir = os.path.dirname(transcript_path)
         os.makedirs(output_dir, exist_ok=True)
-
-        # Now write to the file
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
+        
+        # Memory-map the decoded samples of large files instead of holding them in RAM.
+        # (The size of a video overstates its audio, which only errs towards memory-mapping)
+        mmap_path = None
+        if os.path.getsize(file_path) > global_config.AUDIO_CONFIG.mmap_threshold_mb * 1024 * 1024:
+            mmap_path = os.path.splitext(file_path)[0] + ".pcm"
+        
+        try:
+            with timer.span("audio_decode"):
+                audio = load_audio_pcm(file_path, mmap_path)
+            
+            logger.info("Splitting audio into chunks")
+            with timer.span("audio_split"):
+                if global_config.AUDIO_CONFIG.vad_enabled:
+                    audio_chunks, chunk_offsets = split_audio_on_speech(audio, global_config.AUDIO_CONFIG.chunk_duration_ms)
+                else:
+                    audio_chunks, chunk_offsets = split_audio(audio, global_config.AUDIO_CONFIG.chunk_duration_ms), None
+            
+            chunk_ranges = _chunk_ranges(audio_chunks, chunk_offsets)
+            completed_chunks, checkpoint_language = checkpoint.load(chunk_ranges) if checkpoint else ({}, None)
+            language = language or checkpoint_language
+            
+            with open(transcript_path, "w", encoding="utf-8") as transcript_file:
+                def save_chunk(index, chunk_segments, resumed, chunk_language):
+                    # Save the language the chunks were decoded in, detected or not, so a resumed job keeps it
+                    if checkpoint and not resumed:
+                        checkpoint.save_chunk(index, chunk_ranges[index], len(audio_chunks), chunk_language, chunk_segments)
+                    chunk_text = " ".join(segment[2] for segment in chunk_segments if segment[2])
+                    if chunk_text:
+                        with timer.span("transcript_write"):
+                            transcript_file.write((" " if transcript_file.tell() else "") + chunk_text)
+                            transcript_file.flush()
+                
+                logger.info("Converting speech to text")
+                segments = speech_to_text(
+                    audio_chunks, progress_callback=progress_callback, timer=timer, language=language,
+                    chunk_offsets=chunk_offsets, completed_chunks=completed_chunks, chunk_callback=save_chunk
+                )
+        finally:
+            if mmap_path and os.path.exists(mmap_path):
+                os.remove(mmap_path)
         
         logger.info(f"Transcript saved to: {transcript_path}")
-        return transcript_path
+        return transcript_path, segments
     except Exception as e:
         logger.error(f"Error in audio/video processing: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def process_audio_video(file_path, progress_callback=None, timer=None, language=None):
+    """Transcribe a media file and return the path of the plain text transcript"""
+    return _transcribe_media(file_path, progress_callback, timer, language)[0]
+
+def process_audio_video_timed(file_path, progress_callback=None, language=None, checkpoint=None):
+    """Run process_audio_video and return the transcript path, the segments and the stage timings.
+
+    Meant for the transcription worker processes, where the timer of the
+    caller can't be shared. Decoded chunks are saved with `checkpoint`.
+    """
+    timer = StageTimer()
+    transcript_path, segments = _transcribe_media(file_path, progress_callback, timer, language, checkpoint)
+    return transcript_path, segments, timer.observations
@@ -0,0 +1,248 @@
+import re
+from xml.etree.ElementTree import Element
+import docx
+import markdown
+from docx.oxml.numbering import CT_Num
+from docx.shared import Pt
+from markdown.preprocessors import Preprocessor
+from markdown.treeprocessors import Treeprocessor
+
+MARKDOWN_EXTENSIONS = ["tables", "sane_lists"]
+MONOSPACE_FONT = "Consolas"
+# Deepest list level with its own style in the default template
+MAX_LIST_LEVEL = 3
+_STASH_PLACEHOLDER = re.compile("\x02wzxhzdk:(\\d+)\x03")
+_HTML_TAG = re.compile(r"<[^>]+>")
+_LIST_ITEM = re.compile(r"^( *)(?:[-*+]|\d+[.)])\s")
+_FENCE = re.compile(r"^ *(```|~~~)")
+_BLOCK_TAGS = {"p", "ul", "ol", "table", "blockquote", "pre", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "div"}
+
+class _NormalizeListIndent(Preprocessor):
+    """Re-indent nested list items by 4 spaces per level.
+
+    Python-Markdown only nests lists indented by 4 spaces, while LLMs often
+    indent them by 2 or 3. Indented lines below an item move with it.
+    """
+
+    def run(self, lines):
+        output = []
+        indents = []  # Original indents of the list items containing the current line
+        shift = 0
+        in_fence = False
+        for line in lines:
+            if _FENCE.match(line):
+                in_fence = not in_fence
+            match = None if in_fence else _LIST_ITEM.match(line)
+            if match and (indents or len(match.group(1)) < 4):
+                indent = len(match.group(1))
+                while indents and indent < indents[-1]:
+                    indents.pop()
+                if not indents or indent > indents[-1]:
+                    indents.append(indent)
+                shift = 4 * (len(indents) - 1) - indent
+            elif indents and line.strip() and not line.startswith(" ") and not in_fence:
+                # An unindented paragraph ends the lists
+                indents = []
+                shift = 0
+            if indents and shift and line.strip():
+                line = " " * shift + line if shift > 0 else line[min(-shift, len(line) - len(line.lstrip(" "))):]
+            output.append(line)
+        return output
+
+class _KeepTree(Treeprocessor):
+    """Keep the parsed element tree on the Markdown instance instead of serializing it"""
+
+    def run(self, root):
+        self.md.docx_tree = root
+
+def create_markdown_parser() -> markdown.Markdown:
+    """Markdown parser of the minutes: tables, sane lists and LLM-style list indents"""
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    # After the whitespace normalization, before the block parser
+    md.preprocessors.register(_NormalizeListIndent(md), "list_indent", 25)
+    return md
+
+class DocxRenderer:
+    """Render Markdown to a Word document in one pass over its parsed element tree.
+
+    Headings, paragraphs with bold/italic/code runs, nested bullet and
+    numbered lists, tables, block quotes and code blocks are emitted as
+    python-docx paragraphs, runs and tables.
+    """
+
+    def __init__(self, document=None):
+        self.document = document or docx.Document()
+        # Style and numbering lookups scan the whole definitions part, they are resolved once per document
+        self._style_ids = {}
+        self._abstract_num_ids = {}
+        self._numbering = None
+        self._next_num_id = None
+        self._md = create_markdown_parser()
+        # After the inline patterns and the unescaping of backslash escapes
+        self._md.treeprocessors.register(_KeepTree(self._md), "docx_tree", -10)
+
+    def render(self, markdown_text: str):
+        """Append the rendered Markdown to the document and return the document"""
+        self._md.reset()
+        self._md.convert(markdown_text)
+        for element in self._md.docx_tree:
+            self._block(element)
+        return self.document
+
+    def _block(self, element: Element, list_level: int = 0):
+        tag = element.tag
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._inline(self._add_paragraph(f"Heading {tag[1]}"), element)
+        elif tag == "p":
+            self._inline(self._add_paragraph(), element)
+        elif tag in ("ul", "ol"):
+            self._list(element, list_level + 1)
+        elif tag == "table":
+            self._table(element)
+        elif tag == "blockquote":
+            for child in element:
+                if child.tag == "p":
+                    self._inline(self._add_paragraph("Quote"), child)
+                else:
+                    self._block(child, list_level)
+        elif tag == "pre":
+            paragraph = self._add_paragraph()
+            run = paragraph.add_run(self._restore("".join(element.itertext())).rstrip("\n"))
+            run.font.name = MONOSPACE_FONT
+            run.font.size = Pt(9)
+        elif tag == "hr":
+            return
+        else:
+            # div or unknown blocks: render their children, or their text as a paragraph
+            if len(element) and all(child.tag in _BLOCK_TAGS for child in element):
+                for child in element:
+                    self._block(child, list_level)
+            elif "".join(element.itertext()).strip():
+                self._inline(self._add_paragraph(), element)
+
+    def _list(self, element: Element, level: int):
+        ordered = element.tag == "ol"
+        style_level = min(level, MAX_LIST_LEVEL)
+        style = ("List Number" if ordered else "List Bullet") + (f" {style_level}" if style_level > 1 else "")
+        num_id = self._restart_numbering(style, int(element.get("start", 1))) if ordered else None
+
+        for item in element:
+            if item.tag != "li":
+                continue
+            paragraph = self._add_paragraph(style)
+            if num_id is not None:
+                num_pr = paragraph._p.get_or_add_pPr().get_or_add_numPr()
+                num_pr.get_or_add_ilvl().val = 0
+                num_pr.get_or_add_numId().val = num_id
+
+            # Loose list items wrap their text in paragraphs, the first one goes on the bullet
+            inline_item = Element("li")
+            inline_item.text = item.text
+            blocks = []
+            for child in item:
+                if child.tag in _BLOCK_TAGS:
+                    blocks.append(child)
+                elif blocks:
+                    blocks.append(child)
+                else:
+                    inline_item.append(child)
+            if blocks and blocks[0].tag == "p" and not "".join(inline_item.itertext()).strip():
+                inline_item = blocks.pop(0)
+            self._inline(paragraph, inline_item)
+
+            for child in blocks:
+                if child.tag in ("ul", "ol"):
+                    self._list(child, level + 1)
+                elif child.tag == "p":
+                    continuation = "List Continue" + (f" {style_level}" if style_level > 1 else "")
+                    self._inline(self._add_paragraph(continuation), child)
+                else:
+                    self._block(child, level)
+
+    def _add_paragraph(self, style: str = None):
+        paragraph = self.document.add_paragraph()
+        if style:
+            paragraph._p.style = self._style_id(style)
+        return paragraph
+
+    def _style_id(self, name: str) -> str:
+        if name not in self._style_ids:
+            self._style_ids[name] = self.document.styles[name].style_id
+        return self._style_ids[name]
+
+    def _restart_numbering(self, style: str, start: int) -> int:
+        """Create a numbering instance of a list style restarting at `start`, so each list counts from its own start"""
+        if self._numbering is None:
+            self._numbering = self.document.part.numbering_part.numbering_definitions._numbering
+            self._next_num_id = max((num.numId for num in self._numbering.num_lst), default=0) + 1
+        if style not in self._abstract_num_ids:
+            style_num_id = self.document.styles[style].element.pPr.numPr.numId.val
+            self._abstract_num_ids[style] = self._numbering.num_having_numId(style_num_id).abstractNumId.val
+        
+        num_id = self._next_num_id
+        self._next_num_id += 1
+        num = self._numbering._insert_num(CT_Num.new(num_id, self._abstract_num_ids[style]))
+        num.add_lvlOverride(ilvl=0).add_startOverride(start)
+        return num_id
+
+    def _table(self, element: Element):
+        rows = [row for section in element for row in (section if section.tag in ("thead", "tbody") else [section]) if row.tag == "tr"]
+        if not rows:
+            return
+        columns = max(len(row) for row in rows)
+        table = self.document.add_table(rows=len(rows), cols=columns)
+        table._tbl.tblPr.style = self._style_id("Table Grid")
+        for row, table_row in zip(rows, table.rows):
+            for cell, table_cell in zip(row, table_row.cells):
+                self._inline(table_cell.paragraphs[0], cell, bold=cell.tag == "th")
+
+    def _inline(self, paragraph, element: Element, bold: bool = False, italic: bool = False, code: bool = False):
+        """Add the text of an element and its inline children to a paragraph as formatted runs"""
+        self._add_run(paragraph, element.text, bold, italic, code)
+        for child in element:
+            tag = child.tag
+            if tag == "br":
+                paragraph.add_run().add_break()
+                self._add_run(paragraph, (child.tail or "").lstrip(), bold, italic, code)
+                continue
+            elif tag == "img":
+                self._add_run(paragraph, child.get("alt"), bold, italic, code)
+            else:
+                self._inline(
+                    paragraph, child,
+                    bold=bold or tag in ("strong", "b"),
+                    italic=italic or tag in ("em", "i"),
+                    code=code or tag == "code",
+                )
+            self._add_run(paragraph, child.tail, bold, italic, code)
+
+    def _add_run(self, paragraph, text, bold, italic, code):
+        if not text:
+            return
+        text = self._restore(text)
+        if not code:
+            # Soft line breaks inside a paragraph are spaces
+            text = text.replace("\n", " ")
+            if not paragraph.runs:
+                text = text.lstrip()
+        if not text:
+            return
+        run = paragraph.add_run(text)
+        # Plain runs get no run properties at all
+        if bold:
+            run.bold = True
+        if italic:
+            run.italic = True
+        if code:
+            run.font.name = MONOSPACE_FONT
+
+    def _restore(self, text: str) -> str:
+        """Replace the placeholders of raw HTML with its text content"""
+        if "\x02" not in text:
+            return text
+        stash = self._md.htmlStash.rawHtmlBlocks
+        return _STASH_PLACEHOLDER.sub(lambda match: _HTML_TAG.sub("", str(stash[int(match.group(1))])), text)
+
+def render_markdown_to_docx(markdown_text: str, document=None):
+    """Render Markdown into a new (or the given) python-docx Document"""
+    return DocxRenderer(document).render(markdown_text)
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+@lru_cache(maxsize=1)
+def _language_tables() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """LANGUAGES and TO_LANGUAGE_CODE of whisper.tokenizer.
+
+    The tokenizer module is loaded on its own when the whisper package isn't
+    imported yet, so the API can validate languages without loading torch.
+    """
+    tokenizer = sys.modules.get("whisper.tokenizer")
+    if tokenizer is None:
+        path = os.path.join(importlib.util.find_spec("whisper").submodule_search_locations[0], "tokenizer.py")
+        spec = importlib.util.spec_from_file_location("_whisper_tokenizer_languages", path)
+        tokenizer = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tokenizer)
+    return tokenizer.LANGUAGES, tokenizer.TO_LANGUAGE_CODE
+
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """Return the Whisper code of a language given by code or name, None for automatic detection"""
+    if not language:
+        return None
+    languages, to_language_code = _language_tables()
+    language = language.strip().lower()
+    if language in languages:
+        return language
+    if language in to_language_code:
+        return to_language_code[language]
+    raise ValueError(f"Unsupported language: {language}")
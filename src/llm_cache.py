@@ -0,0 +1,85 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional, Sequence
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+class LLMCache:
+    """Content-addressed cache of LLM responses stored in SQLite.
+
+    Entries are keyed on a hash of the model id and the full chat messages
+    (prompts and transcript), expire after `ttl_seconds`, and the least
+    recently used entries are evicted above `max_entries`.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int, max_entries: int):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_cache (last_accessed)")
+
+    def _connect(self):
+        # Called from worker threads: one short-lived connection per operation
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(model_id: str, messages: Sequence) -> str:
+        digest = hashlib.sha256(model_id.encode("utf-8"))
+        for message in messages:
+            digest.update(b"\0")
+            digest.update(str(message.role).encode("utf-8"))
+            digest.update(b"\0")
+            digest.update((message.content or "").encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE llm_cache SET last_accessed = ? WHERE key = ?", (now, key))
+        return row[0] if row else None
+
+    def set(self, key: str, model_id: str, response: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model_id, response, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+_cache_config = global_config.CACHE_CONFIG
+llm_cache = LLMCache(
+    _cache_config.db_path,
+    ttl_seconds=_cache_config.ttl_hours * 3600,
+    max_entries=_cache_config.max_entries,
+) if _cache_config.enabled else None
@@ -0,0 +1,212 @@
+import json
+import random
+import threading
+import time
+from typing import Callable, Iterator, Optional, Sequence
+import requests
+from requests.adapters import HTTPAdapter
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second on average, in bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting for one to be refilled if the bucket is empty"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class GeminiBackend:
+    """Chat with Gemini through LlamaIndex. The client, and its connection, is created once on first use"""
+
+    def __init__(self, model: str, api_key: str, timeout: float):
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self._llm = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return self.model
+
+    def _get_llm(self):
+        with self._lock:
+            if self._llm is None:
+                from llama_index.llms.gemini import Gemini
+
+                logger.info(f"Initializing LLM with model: {self.model}")
+                self._llm = Gemini(model=self.model, api_key=self.api_key, request_options={"timeout": self.timeout})
+            return self._llm
+
+    def chat(self, messages: Sequence) -> str:
+        response = self._get_llm().chat(messages)
+        if hasattr(response, 'text'):
+            return response.text
+        return response.message.content
+
+    def stream_chat(self, messages: Sequence) -> Iterator[str]:
+        for response in self._get_llm().stream_chat(messages):
+            if response.delta:
+                yield response.delta
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        from google.api_core import exceptions as google_exceptions
+
+        if isinstance(error, google_exceptions.GoogleAPICallError):
+            return error.code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (TimeoutError, ConnectionError, google_exceptions.RetryError))
+
+class HTTPBackend:
+    """Chat with an HTTP server, e.g. a local stub standing in for the LLM in tests and benchmarks.
+
+    Sends POST {url}/chat with {"messages": [{"role", "content"}], "stream"}
+    and reads the reply from the "content" field of the JSON response, or
+    from JSON lines of "delta" fields when streaming. Connections are kept
+    alive in a pooled session.
+    """
+
+    def __init__(self, url: str, timeout: float, pool_size: int):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @property
+    def model_id(self) -> str:
+        return f"http:{self.url}"
+
+    @staticmethod
+    def _payload(messages: Sequence, stream: bool = False) -> dict:
+        return {
+            "messages": [{"role": str(getattr(m.role, "value", m.role)), "content": m.content} for m in messages],
+            "stream": stream,
+        }
+
+    def chat(self, messages: Sequence) -> str:
+        response = self._session.post(f"{self.url}/chat", json=self._payload(messages), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["content"]
+
+    def stream_chat(self, messages: Sequence) -> Iterator[str]:
+        """Read a streamed reply: one JSON object with a "delta" field per line"""
+        with self._session.post(f"{self.url}/chat", json=self._payload(messages, stream=True), timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)["delta"]
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+class LLMClient:
+    """Process-wide LLM client shared by every job.
+
+    Calls go through a semaphore bounding the concurrent requests and a
+    token bucket limiting their rate. Throttled or transiently failed calls
+    are retried with exponential backoff and full jitter.
+    """
+
+    def __init__(self, backend, max_concurrency: int, requests_per_minute: float, burst: int,
+                 max_retries: int, retry_base_seconds: float, retry_max_seconds: float):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._rate_limiter = TokenBucket(requests_per_minute / 60, burst)
+
+    @property
+    def model_id(self) -> str:
+        return self.backend.model_id
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+
+    def chat(self, messages: Sequence) -> str:
+        """Send chat messages and return the text of the reply"""
+        return self._call(lambda: self.backend.chat(messages))
+
+    def stream_chat(self, messages: Sequence, on_text: Optional[Callable[[str], None]] = None) -> str:
+        """Like chat, streaming the reply and calling `on_text` with the text received so far.
+
+        A retried call starts over, so `on_text` may see the text shrink back.
+        """
+        def stream():
+            text = ""
+            for delta in self.backend.stream_chat(messages):
+                text += delta
+                if on_text:
+                    on_text(text)
+            return text
+        return self._call(stream)
+
+    def _call(self, request: Callable[[], str]) -> str:
+        attempt = 0
+        while True:
+            with self._slots:
+                self._rate_limiter.acquire()
+                try:
+                    return request()
+                except Exception as e:
+                    if attempt >= self.max_retries or not self.backend.is_retryable(e):
+                        logger.error(f"LLM call failed after {attempt + 1} attempts: {str(e)}")
+                        raise
+                    error = e
+            # Wait outside the semaphore so other calls can use the slot
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning(f"LLM call failed ({type(error).__name__}: {str(error)}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+def create_llm_client(backend: Optional[str] = None) -> LLMClient:
+    """Create an LLM client from the LLM_* settings"""
+    client_config = global_config.LLM_CLIENT_CONFIG
+    backend = backend or client_config.backend
+    if backend == "gemini":
+        llm_backend = GeminiBackend(global_config.GEMINI_CONFIG.model_id, global_config.GEMINI_CONFIG.api_key, client_config.timeout_seconds)
+    elif backend == "http":
+        llm_backend = HTTPBackend(client_config.http_url, client_config.timeout_seconds, client_config.max_concurrency)
+    else:
+        raise ValueError(f"Unknown LLM backend: {backend}")
+    return LLMClient(
+        llm_backend,
+        max_concurrency=client_config.max_concurrency,
+        requests_per_minute=client_config.requests_per_minute,
+        burst=client_config.burst,
+        max_retries=client_config.max_retries,
+        retry_base_seconds=client_config.retry_base_seconds,
+        retry_max_seconds=client_config.retry_max_seconds,
+    )
+
+llm_client = create_llm_client()
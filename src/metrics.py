@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Upper bounds in seconds of the stage duration histogram buckets
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, float("inf"))
+
+class StageTimer:
+    """Collects the durations of the processing stages of a job.
+
+    Thread safe, so the concurrent LLM calls of a map-reduce summary can
+    share one timer.
+    """
+
+    def __init__(self):
+        self.observations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the body of a `with` block as one observation of `stage`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.observations.setdefault(stage, []).append(seconds)
+
+    def merge(self, observations: Dict[str, List[float]]):
+        """Add the observations of a timer from another process"""
+        for stage, values in observations.items():
+            for seconds in values:
+                self.add(stage, seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count, total and max durations, as stored in the job metadata"""
+        with self._lock:
+            return {
+                stage: {"count": len(values), "total_seconds": round(sum(values), 3), "max_seconds": round(max(values), 3)}
+                for stage, values in self.observations.items()
+            }
+
+def bucket_for(seconds: float) -> float:
+    """Return the upper bound of the histogram bucket of a duration"""
+    return next(le for le in STAGE_BUCKETS if seconds <= le)
+
+def _format_le(le: float) -> str:
+    return "+Inf" if le == float("inf") else repr(le)
+
+def render_prometheus(stage_histograms: Dict[str, Dict], queue_stats: Dict[str, int],
+                      executor_stats: Dict[str, Dict[str, Dict[str, int]]] = None) -> str:
+    """Render the metrics in the Prometheus text exposition format.
+
+    `stage_histograms` maps each stage to its per-bucket counts ("buckets",
+    keyed by upper bound, not cumulative), "count" and "sum".
+    `executor_stats` maps each worker to the stats of its executor pools.
+    """
+    lines = [
+        "# HELP meeting_note_stage_duration_seconds Duration of the processing stages of jobs.",
+        "# TYPE meeting_note_stage_duration_seconds histogram",
+    ]
+    for stage, histogram in sorted(stage_histograms.items()):
+        cumulative = 0
+        for le in STAGE_BUCKETS:
+            cumulative += histogram["buckets"].get(le, 0)
+            lines.append(f'meeting_note_stage_duration_seconds_bucket{{stage="{stage}",le="{_format_le(le)}"}} {cumulative}')
+        lines.append(f'meeting_note_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]}')
+        lines.append(f'meeting_note_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+
+    lines += [
+        "# HELP meeting_note_jobs_queued Jobs waiting for a worker.",
+        "# TYPE meeting_note_jobs_queued gauge",
+        f"meeting_note_jobs_queued {queue_stats['queued']}",
+        "# HELP meeting_note_jobs_in_flight Jobs currently processed by a worker.",
+        "# TYPE meeting_note_jobs_in_flight gauge",
+        f"meeting_note_jobs_in_flight {queue_stats['in_flight']}",
+    ]
+    for name, help_text in (
+        ("workers", "Size of the executor pools of the workers."),
+        ("in_flight", "Tasks submitted to the executor pools of the workers."),
+        ("queued", "Tasks waiting for a free executor pool slot."),
+    ):
+        lines += [f"# HELP meeting_note_executor_{name} {help_text}", f"# TYPE meeting_note_executor_{name} gauge"]
+        for worker_id, pools in sorted((executor_stats or {}).items()):
+            for pool, stats in sorted(pools.items()):
+                lines.append(f'meeting_note_executor_{name}{{worker="{worker_id}",pool="{pool}"}} {stats[name]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import torch
+import whisper
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+def _model_size_bytes(model) -> int:
+    """Approximate memory held by a model's weights and buffers."""
+    params = sum(p.numel() * p.element_size() for p in model.parameters())
+    buffers = sum(b.numel() * b.element_size() for b in model.buffers())
+    return params + buffers
+
+class WhisperModelRegistry:
+    """Process-wide cache of loaded Whisper models keyed by (model size, device).
+
+    Models are loaded on first use and shared by every caller in the process.
+    When the total size of loaded models exceeds the memory budget, the least
+    recently used models are evicted.
+    """
+
+    def __init__(self, memory_budget_mb: int):
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self._models: "OrderedDict[Tuple[str, str], whisper.Whisper]" = OrderedDict()
+        self._sizes: dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _resolve_key(self, model_size: Optional[str], device: Optional[str]) -> Tuple[str, str]:
+        model_size = model_size or global_config.WHISPER_CONFIG.model_size
+        device = device or global_config.WHISPER_CONFIG.device or ("cuda" if torch.cuda.is_available() else "cpu")
+        return model_size, device
+
+    def get_model(self, model_size: Optional[str] = None, device: Optional[str] = None):
+        """Return a loaded Whisper model, loading it on first request"""
+        key = self._resolve_key(model_size, device)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+
+            logger.info(f"Loading Whisper model '{key[0]}' on {key[1]}")
+            model = whisper.load_model(key[0], device=key[1])
+            self._models[key] = model
+            self._sizes[key] = _model_size_bytes(model)
+            logger.info(f"Whisper model '{key[0]}' loaded ({self._sizes[key] / 1024 / 1024:.1f} MB)")
+            self._evict(keep=key)
+            return model
+
+    def _evict(self, keep: Tuple[str, str]):
+        """Evict least recently used models until the budget is respected"""
+        while self.memory_usage() > self.memory_budget_bytes and len(self._models) > 1:
+            key = next(iter(self._models))
+            if key == keep:
+                break
+            self._models.pop(key)
+            freed = self._sizes.pop(key)
+            logger.info(f"Evicted Whisper model '{key[0]}' on {key[1]} ({freed / 1024 / 1024:.1f} MB)")
+        if self.memory_usage() > self.memory_budget_bytes:
+            logger.warning(f"Whisper models exceed memory budget: {self.memory_usage() / 1024 / 1024:.1f} MB in use")
+
+    def memory_usage(self) -> int:
+        return sum(self._sizes.values())
+
+    def loaded_models(self) -> list[Tuple[str, str]]:
+        with self._lock:
+            return list(self._models.keys())
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+whisper_registry = WhisperModelRegistry(global_config.WHISPER_CONFIG.memory_budget_mb)
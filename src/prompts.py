@@ -64,4 +64,23 @@ EXAMPLE_OUTPUT = """
 
 ## Additional Notes
 - The idea of hiring a clown for the party was dismissed due to cost.
-"""
\ No newline at end of file
+"""
+
+INSTRUCTIONS_SUMMARIZE_TRANSCRIPT_CHUNK = """
+You will receive one part of a longer meeting transcript. Consecutive parts overlap slightly.
+Write concise notes for this part only, keeping every detail needed for the final meeting minutes:
+
+- Date, time, and location if mentioned.
+- Participants who speak or are mentioned.
+- Goals and key discussion points.
+- Decisions made.
+- Tasks assigned, with owners and deadlines.
+- Any other important points.
+
+Do not invent information that is not in this part. Return the notes in markdown.
+"""
+
+INSTRUCTIONS_MERGE_MEETING_MINUTES = """
+You will receive notes written for consecutive parts of one meeting transcript, in order.
+Merge them into a single set of meeting minutes, removing the duplicates caused by the overlap between parts.
+"""
@@ -0,0 +1,73 @@
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    text: str
+    chunk_index: int
+
+class SegmentStore:
+    """Timestamped transcript segments, in time order.
+
+    Times and chunk indexes are kept in flat typed arrays rather than one
+    object per segment, which keeps hours-long transcripts compact and cheap
+    to pickle between processes.
+    """
+
+    def __init__(self, segments: Iterable[Sequence] = (), language: Optional[str] = None):
+        self.language = language
+        self._starts = array("d")
+        self._ends = array("d")
+        self._chunks = array("i")
+        self._texts: List[str] = []
+        for start, end, text, chunk_index in segments:
+            self.append(start, end, text, chunk_index)
+
+    def append(self, start: float, end: float, text: str, chunk_index: int):
+        self._starts.append(start)
+        self._ends.append(end)
+        self._texts.append(text)
+        self._chunks.append(chunk_index)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, index: int) -> Segment:
+        return Segment(self._starts[index], self._ends[index], self._texts[index], self._chunks[index])
+
+    def __iter__(self) -> Iterator[Segment]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def text(self) -> str:
+        """The plain transcript: segment texts joined by spaces"""
+        return " ".join(text for text in self._texts if text)
+
+    def to_rows(self) -> List[Tuple[int, float, float, int, str]]:
+        """(seq, start, end, chunk_index, text) rows as stored in the transcript_segments table"""
+        return [(seq, self._starts[seq], self._ends[seq], self._chunks[seq], self._texts[seq]) for seq in range(len(self))]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], language: Optional[str] = None) -> "SegmentStore":
+        """Build a store from (start, end, chunk_index, text) rows"""
+        return cls(((start, end, text, chunk_index) for start, end, chunk_index, text in rows), language)
+
+    def to_srt(self) -> str:
+        return "".join(
+            f"{number}\n{_format_timestamp(segment.start, ',')} --> {_format_timestamp(segment.end, ',')}\n{segment.text.strip()}\n\n"
+            for number, segment in enumerate(self, start=1)
+        )
+
+    def to_vtt(self) -> str:
+        return "WEBVTT\n\n" + "".join(
+            f"{_format_timestamp(segment.start, '.')} --> {_format_timestamp(segment.end, '.')}\n{segment.text.strip()}\n\n"
+            for segment in self
+        )
+
+def _format_timestamp(seconds: float, decimal_marker: str) -> str:
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
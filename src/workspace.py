@@ -0,0 +1,62 @@
+import os
+import shutil
+from typing import List
+from src.config import GlobalConfig
+from src.logger import get_formatted_logger
+
+logger = get_formatted_logger(__name__)
+
+global_config = GlobalConfig()
+
+class DiskQuotaExceeded(Exception):
+    """Raised when a job can't be admitted because of temp disk limits"""
+
+def get_workspace_path(job_id: str) -> str:
+    """Return the temp directory owned by a job"""
+    return os.path.join(global_config.PathConfig.tempt_path, job_id)
+
+def create_workspace(job_id: str) -> str:
+    """Create the temp directory of a job and return its path"""
+    path = get_workspace_path(job_id)
+    os.makedirs(path, exist_ok=True)
+    logger.debug(f"Created workspace for job {job_id}: {path}")
+    return path
+
+def remove_workspace(job_id: str):
+    """Delete the temp directory of a job and everything in it"""
+    path = get_workspace_path(job_id)
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+        logger.debug(f"Removed workspace for job {job_id}: {path}")
+
+def list_workspaces() -> List[str]:
+    """Return the IDs of the jobs that have a workspace"""
+    temp_path = global_config.PathConfig.tempt_path
+    if not os.path.exists(temp_path):
+        return []
+    return [entry.name for entry in os.scandir(temp_path) if entry.is_dir()]
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                # File removed by a finishing job while walking
+                continue
+    return total
+
+def check_disk_quota(incoming_bytes: int = 0):
+    """Raise DiskQuotaExceeded if a job of `incoming_bytes` would exceed the temp disk limits"""
+    temp_path = global_config.PathConfig.tempt_path
+    quota = global_config.WORKSPACE_CONFIG
+
+    free_bytes = shutil.disk_usage(temp_path).free
+    if free_bytes - incoming_bytes < quota.min_free_mb * 1024 * 1024:
+        raise DiskQuotaExceeded(f"Not enough free disk space: {free_bytes // (1024 * 1024)} MB left")
+
+    if quota.max_temp_mb:
+        used_bytes = _directory_size(temp_path)
+        if used_bytes + incoming_bytes > quota.max_temp_mb * 1024 * 1024:
+            raise DiskQuotaExceeded(f"Temp storage quota exceeded: {used_bytes // (1024 * 1024)} MB in use")